@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class AccountsConfig(AppConfig):
+    """
+    App pendamping buat management command & signal auth service.
+    Label dibedakan dari 'auth' supaya nggak bentrok sama django.contrib.auth.
+    """
+    name = 'auth.accounts'
+    label = 'accounts'
+    default_auto_field = 'django.db.models.BigAutoField'
+
+    def ready(self):
+        from . import signals  # noqa: F401
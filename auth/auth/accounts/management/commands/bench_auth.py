@@ -0,0 +1,53 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from auth.benchmarks import compare, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark offline hot path auth (login, verify-session, refresh, logout, change-password, list user, metrics). "
+        "Jalankan dengan DJANGO_SETTINGS_MODULE=auth.settings_bench."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--slow-requests', type=int, default=10, help="Jumlah request buat skenario PBKDF2 (login, change-password)")
+        parser.add_argument('--only', action='append', help="Jalankan skenario tertentu saja (bisa diulang)")
+        parser.add_argument('--serialization', action='store_true', help="Ikut benchmark renderer JSON / orjson / MessagePack")
+        parser.add_argument('--output', help="Simpan hasil sebagai baseline JSON")
+        parser.add_argument('--compare', help="Baseline JSON pembanding, gagal kalau ada regresi")
+        parser.add_argument('--threshold', type=float, default=0.2, help="Toleransi latency/throughput (0.2 = 20%%)")
+
+    def handle(self, *args, **options):
+        from django.conf import settings
+
+        if settings.SETTINGS_MODULE != 'auth.settings_bench':
+            raise CommandError("Jalankan dengan DJANGO_SETTINGS_MODULE=auth.settings_bench (command ini flush database)")
+
+        results = run_benchmarks(
+            requests=max(1, options['requests']),
+            slow_requests=max(1, options['slow_requests']),
+            only=options['only'],
+            serialization=options['serialization'],
+        )
+
+        self.stdout.write(f"{'scenario':<22}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'queries':>9}{'bytes':>10}")
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<22}{result['throughput_rps']:>10}{result['p50_ms']:>10}"
+                f"{result['p99_ms']:>10}{result['queries_per_request']:>9}{result.get('payload_bytes', ''):>10}"
+            )
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, indent=2) + '\n', encoding='utf-8')
+            self.stdout.write(f"Baseline saved to {options['output']}")
+
+        if options['compare']:
+            baseline = json.loads(Path(options['compare']).read_text(encoding='utf-8'))
+            regressions = compare(baseline, results, threshold=options['threshold'])
+            if regressions:
+                raise CommandError("Performance regression:\n  " + "\n  ".join(regressions))
+            self.stdout.write(self.style.SUCCESS("No regression against baseline"))
@@ -0,0 +1,55 @@
+from time import perf_counter
+
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.sessions.backends.db import SessionStore as DBSessionStore
+from django.core.management.base import BaseCommand
+
+from auth.session_backend import CacheSessionStore, CachedDBSessionStore
+
+ENGINES = {
+    'db': DBSessionStore,
+    'cache': CacheSessionStore,
+    'cached_db': CachedDBSessionStore,
+}
+
+
+class Command(BaseCommand):
+    help = "Benchmark sessions/s (create, load, delete) untuk tiap session engine."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=1000)
+        parser.add_argument('--engine', choices=list(ENGINES), action='append',
+                            help="Bisa diulang. Default: semua engine.")
+
+    def handle(self, *args, **options):
+        count = max(1, options['count'])
+
+        for name in options['engine'] or list(ENGINES):
+            store_class = ENGINES[name]
+            keys = []
+
+            # payload sama kayak hasil login()
+            start = perf_counter()
+            for i in range(count):
+                session = store_class()
+                session[SESSION_KEY] = str(i)
+                session[BACKEND_SESSION_KEY] = 'django.contrib.auth.backends.ModelBackend'
+                session[HASH_SESSION_KEY] = 'f' * 64
+                session.create()
+                keys.append(session.session_key)
+            created = perf_counter() - start
+
+            start = perf_counter()
+            for key in keys:
+                store_class(session_key=key).get(SESSION_KEY)
+            loaded = perf_counter() - start
+
+            start = perf_counter()
+            for key in keys:
+                store_class(session_key=key).delete()
+            deleted = perf_counter() - start
+
+            self.stdout.write(
+                f"{name:<10} create {count / created:>9.0f}/s   "
+                f"load {count / loaded:>9.0f}/s   delete {count / deleted:>9.0f}/s"
+            )
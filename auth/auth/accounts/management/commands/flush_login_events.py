@@ -0,0 +1,34 @@
+from time import monotonic, sleep
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from auth.login_events import flush
+
+
+class Command(BaseCommand):
+    help = "Tulis last_login & audit login/logout yang di-buffer di Redis ke database (bulk)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Jalan terus, flush tiap --interval detik")
+        parser.add_argument('--interval', type=float, default=None,
+                            help="Default: settings.LOGIN_EVENTS_FLUSH_INTERVAL (delay maksimal sampai data masuk DB)")
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or getattr(settings, 'LOGIN_EVENTS_FLUSH_INTERVAL', 5)
+
+        while True:
+            started = monotonic()
+            try:
+                last_logins, events = flush()
+                if last_logins or events or not options['loop']:
+                    self.stdout.write(f"flushed {last_logins} last_login, {events} events in {(monotonic() - started) * 1000:.1f} ms")
+            except Exception as e:
+                if not options['loop']:
+                    raise
+                # data tetap di Redis (key :processing), dicoba lagi di putaran berikutnya
+                self.stderr.write(f"[ERROR] flush_login_events failed: {e}")
+
+            if not options['loop']:
+                break
+            sleep(max(0, interval - (monotonic() - started)))
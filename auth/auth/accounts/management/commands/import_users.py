@@ -0,0 +1,39 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from auth.importers import DEFAULT_CHUNK_SIZE, import_users
+
+
+class Command(BaseCommand):
+    help = "Import / upsert user dari file CSV atau Excel (.xlsx) per chunk, upsert berdasarkan username."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Path file .csv / .xlsx")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.is_file():
+            raise CommandError(f"File not found: {path}")
+
+        def on_progress(summary):
+            self.stdout.write(
+                f"chunk {summary['chunks']}: {summary['total_rows']} rows, "
+                f"{summary['created']} created, {summary['updated']} updated, {summary['failed']} failed"
+            )
+
+        with path.open('rb') as file:
+            try:
+                summary = import_users(file, path.name, chunk_size=max(1, options['chunk_size']), on_progress=on_progress)
+            except ValueError as e:
+                raise CommandError(str(e))
+
+        for error in summary['errors']:
+            self.stderr.write(f"row {error['row']} ({error['username']}): {error['errors']}")
+        if summary['errors_truncated']:
+            self.stderr.write("... more errors truncated")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {summary['imported']} imported ({summary['created']} created, {summary['updated']} updated), {summary['failed']} failed"
+        ))
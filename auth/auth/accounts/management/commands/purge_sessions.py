@@ -0,0 +1,91 @@
+from time import perf_counter, sleep
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, push_to_gateway
+
+CURSOR_KEY = "sessions:purge:cursor"
+
+# Registry sendiri, karena command ini jalan di luar proses gunicorn (di-push ke Pushgateway)
+REGISTRY = CollectorRegistry()
+ROWS_REMOVED = Counter('session_purge_rows_removed_total', 'Expired sessions removed', registry=REGISTRY)
+BATCH_DURATION = Histogram('session_purge_batch_duration_seconds', 'Duration of one purge batch', registry=REGISTRY,
+                           buckets=(.005, .01, .025, .05, .1, .25, .5, 1, 2.5))
+LAST_RUN = Gauge('session_purge_last_run_timestamp_seconds', 'Last time the purge job finished', registry=REGISTRY)
+
+
+class Command(BaseCommand):
+    help = (
+        "Hapus session expired dari django_session per batch kecil (urut primary key), "
+        "dengan time budget, jeda antar batch, dan resume dari key terakhir."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--sleep', type=float, default=0.1, help="Jeda antar batch (detik)")
+        parser.add_argument('--time-budget', type=float, default=60, help="Maksimal durasi (detik), 0 = tanpa batas")
+        parser.add_argument('--reset', action='store_true', help="Mulai dari awal, abaikan cursor tersimpan")
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        time_budget = options['time_budget']
+
+        if options['reset']:
+            cache.delete(CURSOR_KEY)
+        cursor = cache.get(CURSOR_KEY) or ''
+
+        now = timezone.now()
+        started = perf_counter()
+        removed = batches = 0
+        finished = False
+
+        while True:
+            if time_budget and perf_counter() - started >= time_budget:
+                break
+
+            batch_start = perf_counter()
+            keys = list(
+                Session.objects
+                .filter(session_key__gt=cursor, expire_date__lt=now)
+                .order_by('session_key')
+                .values_list('session_key', flat=True)[:batch_size]
+            )
+            if not keys:
+                finished = True
+                break
+
+            deleted, _ = Session.objects.filter(session_key__in=keys, expire_date__lt=now).delete()
+            cursor = keys[-1]
+            cache.set(CURSOR_KEY, cursor, timeout=None)
+
+            elapsed = perf_counter() - batch_start
+            BATCH_DURATION.observe(elapsed)
+            ROWS_REMOVED.inc(deleted)
+            removed += deleted
+            batches += 1
+            self.stdout.write(f"batch {batches}: {deleted} rows in {elapsed * 1000:.1f} ms (cursor={cursor})")
+
+            if len(keys) < batch_size:
+                finished = True
+                break
+            sleep(options['sleep'])
+
+        if finished:
+            cache.delete(CURSOR_KEY)
+
+        LAST_RUN.set_to_current_time()
+        gateway = getattr(settings, 'PROMETHEUS_PUSHGATEWAY', None)
+        if gateway:
+            try:
+                push_to_gateway(gateway, job='purge_sessions', registry=REGISTRY)
+            except Exception as e:
+                self.stderr.write(f"[WARN] push_to_gateway failed: {e}")
+
+        status = "done" if finished else "time budget reached, will resume from cursor"
+        self.stdout.write(self.style.SUCCESS(
+            f"{removed} expired sessions removed in {batches} batches ({perf_counter() - started:.1f}s, {status})"
+        ))
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.db import models
+
+
+class LoginEvent(models.Model):
+    """
+    Audit login / logout. Ditulis batch oleh flush_login_events (write-behind dari Redis).
+    """
+    LOGIN = 'login'
+    LOGOUT = 'logout'
+    EVENT_CHOICES = [(LOGIN, 'Login'), (LOGOUT, 'Logout')]
+
+    # id dari proses yang buffer event, biar flush ulang (at-least-once) nggak bikin duplikat
+    event_id = models.CharField(max_length=32, unique=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, on_delete=models.SET_NULL, db_constraint=False, related_name='+')
+    event = models.CharField(max_length=10, choices=EVENT_CHOICES)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    user_agent = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['user', 'created_at'])]
+
+    def __str__(self):
+        return f"{self.event} user={self.user_id} at {self.created_at}"
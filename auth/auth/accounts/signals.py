@@ -0,0 +1,111 @@
+from django.conf import settings
+from django.contrib.auth import user_logged_in, user_logged_out
+from django.contrib.auth.models import Group, User
+from django.db.models.signals import m2m_changed, pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from auth import login_events, refresh_tokens, session_index
+from auth.claims import bump_generation, invalidate_claims
+from auth.user_resolve import invalidate_users
+
+if getattr(settings, 'LOGIN_WRITE_BEHIND', False):
+    # ganti UPDATE last_login sinkron bawaan django.contrib.auth dengan buffer Redis
+    user_logged_in.disconnect(dispatch_uid='update_last_login')
+    user_logged_in.connect(login_events.record_login, dispatch_uid='login_write_behind')
+    user_logged_out.connect(login_events.record_logout, dispatch_uid='logout_audit')
+
+
+@receiver(user_logged_in, dispatch_uid='session_index_login')
+def index_session_on_login(sender, request, user, **kwargs):
+    if request is None or not hasattr(request, 'session') or not request.session.session_key:
+        return
+    try:
+        session_index.add_session(user.pk, request.session.session_key)
+    except Exception as e:
+        print(f"[WARN] session_index.add_session({user.pk}) failed: {e}")
+
+
+@receiver(user_logged_out, dispatch_uid='session_index_logout')
+def unindex_session_on_logout(sender, request, user, **kwargs):
+    user_id = session_index.session_user_id(request, user)
+    if user_id is None or not request.session.session_key:
+        return
+    try:
+        session_index.remove_session(user_id, request.session.session_key)
+    except Exception as e:
+        print(f"[WARN] session_index.remove_session({user_id}) failed: {e}")
+
+
+@receiver(pre_save, sender=User, dispatch_uid='session_index_remember_active')
+def remember_is_active(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is None or (update_fields is not None and 'is_active' not in update_fields):
+        return
+    instance._was_active = User.objects.filter(pk=instance.pk).values_list('is_active', flat=True).first()
+
+
+@receiver(post_save, sender=User, dispatch_uid='session_index_revoke_on_deactivate')
+def revoke_sessions_on_deactivate(sender, instance, created, **kwargs):
+    was_active = instance.__dict__.pop('_was_active', None)
+    if not created and was_active and not instance.is_active:
+        # UPDATE-nya sudah commit, Redis error jangan sampai bikin 500
+        try:
+            session_index.revoke_user_sessions(instance.pk)
+        except Exception as e:
+            print(f"[WARN] session_index.revoke_user_sessions({instance.pk}) failed: {e}")
+        try:
+            refresh_tokens.revoke_user_refresh_tokens(instance.pk)
+        except Exception as e:
+            print(f"[WARN] refresh_tokens.revoke_user_refresh_tokens({instance.pk}) failed: {e}")
+
+
+@receiver(post_delete, sender=User, dispatch_uid='refresh_tokens_revoke_on_delete')
+def revoke_refresh_tokens_on_delete(sender, instance, **kwargs):
+    try:
+        refresh_tokens.revoke_user_refresh_tokens(instance.pk)
+    except Exception as e:
+        print(f"[WARN] refresh_tokens.revoke_user_refresh_tokens({instance.pk}) failed: {e}")
+
+
+@receiver(post_save, sender=User, dispatch_uid='user_resolve_invalidate_save')
+@receiver(post_delete, sender=User, dispatch_uid='user_resolve_invalidate_delete')
+def invalidate_resolve_cache(sender, instance, update_fields=None, **kwargs):
+    # save(update_fields=['last_login']) waktu login nggak mengubah data resolve
+    if update_fields is not None and not {'username', 'email'} & set(update_fields):
+        return
+    invalidate_users([instance.pk])
+
+
+@receiver(m2m_changed, sender=User.groups.through, dispatch_uid='claims_user_groups')
+@receiver(m2m_changed, sender=User.user_permissions.through, dispatch_uid='claims_user_permissions')
+def invalidate_claims_on_user_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        invalidate_claims([instance.pk])
+    elif pk_set:
+        # dari sisi Group / Permission, pk_set = id user
+        invalidate_claims(pk_set)
+    else:
+        # group.user_set.clear() -> nggak tahu user mana saja
+        bump_generation()
+
+
+@receiver(m2m_changed, sender=Group.permissions.through, dispatch_uid='claims_group_permissions')
+def invalidate_claims_on_group_permissions(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_generation()
+
+
+@receiver(post_save, sender=Group, dispatch_uid='claims_group_save')
+@receiver(post_delete, sender=Group, dispatch_uid='claims_group_delete')
+def invalidate_claims_on_group_change(sender, created=False, **kwargs):
+    if not created:
+        bump_generation()
+
+
+@receiver(post_save, sender=User, dispatch_uid='claims_user_save')
+def invalidate_claims_on_user_save(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and not {'is_superuser', 'is_staff', 'is_active'} & set(update_fields)):
+        return
+    invalidate_claims([instance.pk])
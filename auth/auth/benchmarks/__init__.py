@@ -0,0 +1 @@
+from .runner import compare, run_benchmarks  # noqa: F401
@@ -0,0 +1,233 @@
+"""
+Harness benchmark hot path auth service.
+
+Tiap skenario diukur: throughput (req/s), latency p50/p99 (ms) dan jumlah query per request.
+Jalankan lewat `python manage.py bench_auth` dengan DJANGO_SETTINGS_MODULE=auth.settings_bench.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from statistics import quantiles
+from time import perf_counter
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+PASSWORD = 'bench-password'
+SEED_USERS = 200
+
+
+class _HRStubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({
+            'count': 1,
+            'results': [{'id': 1, 'name': 'Bench Employee', 'code': 'EMP-001', 'branch': 1}],
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_hr_stub():
+    """Stub HR service di port random, return (server, base_url)."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _HRStubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _percentile(samples, pct):
+    if len(samples) < 2:
+        return samples[0]
+    return quantiles(samples, n=100, method='inclusive')[pct - 1]
+
+
+def measure(name, call, requests, prepare=None, warmup=3, check=None):
+    """
+    Jalankan `call()` sebanyak `requests` kali. `prepare()` (kalau ada) dipanggil
+    sebelum tiap request dan nggak ikut dihitung. `check(response)` (kalau ada) dipanggil
+    sekali ke response warmup, buat memastikan skenarionya memang mengukur yang dimaksud.
+    """
+    for _ in range(warmup):
+        if prepare:
+            prepare()
+        response = call()
+
+    if check and warmup:
+        problem = check(response)
+        if problem:
+            raise RuntimeError(f"{name}: {problem}")
+
+    timings = []
+    queries = 0
+    for _ in range(requests):
+        if prepare:
+            prepare()
+        with CaptureQueriesContext(connection) as ctx:
+            start = perf_counter()
+            response = call()
+            timings.append(perf_counter() - start)
+        queries += len(ctx.captured_queries)
+
+        if response.status_code >= 400:
+            raise RuntimeError(f"{name}: HTTP {response.status_code} {getattr(response, 'data', '')}")
+
+    total = sum(timings)
+    return {
+        'requests': requests,
+        'throughput_rps': round(requests / total, 2),
+        'p50_ms': round(_percentile(timings, 50) * 1000, 3),
+        'p99_ms': round(_percentile(timings, 99) * 1000, 3),
+        'queries_per_request': round(queries / requests, 2),
+    }
+
+
+def _seed():
+    call_command('migrate', verbosity=0, interactive=False)
+    call_command('flush', verbosity=0, interactive=False)
+    cache.clear()
+
+    User.objects.bulk_create([
+        User(username=f'user{i}', email=f'user{i}@example.com', first_name='Bench', last_name=str(i), is_staff=i % 10 == 0)
+        for i in range(SEED_USERS)
+    ])
+    user = User.objects.create_user('bench', 'bench@example.com', PASSWORD)
+    User.objects.create_superuser('bench-admin', 'admin@example.com', PASSWORD)
+    return user
+
+
+def run_benchmarks(requests=200, slow_requests=10, only=None, serialization=False):
+    """
+    `slow_requests` dipakai buat skenario yang kena PBKDF2 (login, change-password).
+    `serialization=True` ikut jalankan benchmark renderer (lihat serialization.py).
+    Return dict {nama_skenario: hasil}.
+    """
+    from auth import views
+    from auth.refresh_tokens import issue_refresh_token
+    from auth.renderers import msgpack
+
+    from .serialization import run_serialization_benchmarks
+
+    server, hr_url = start_hr_stub()
+    hr_original = views.HR_SERVICE
+    views.HR_SERVICE = hr_url
+
+    try:
+        user = _seed()
+        token = Token.objects.create(user=user)
+
+        login_client = APIClient()
+        session_client = APIClient()
+        session_client.force_login(user)
+        logout_client = APIClient()
+        token_client = APIClient()
+        token_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        anon = APIClient()
+
+        passwords = [PASSWORD, PASSWORD + '-2']
+
+        refresh_tokens = [issue_refresh_token(user.pk)]
+
+        def refresh():
+            response = anon.post('/api/auth/refresh/', {'refresh_token': refresh_tokens[0]}, format='json')
+            if response.status_code == 200:
+                refresh_tokens[0] = response.data['refresh_token']
+            return response
+
+        def check_filtered(response):
+            # user1, user10..user19, user100..user199 yang is_staff (i % 10 == 0)
+            expected = User.objects.filter(is_staff=True, username__icontains='user1').count()
+            if len(response.data) != expected or expected >= SEED_USERS // 10:
+                return f"filter/search not applied: {len(response.data)} rows, expected {expected}"
+            return None
+
+        def change_password():
+            old, new = passwords
+            passwords.reverse()
+            return token_client.post('/api/auth/change-password/', {'old_password': old, 'new_password': new}, format='json')
+
+        scenarios = {
+            'login': dict(
+                call=lambda: login_client.post('/api/auth/login/', {'username': 'bench', 'password': passwords[0]}, format='json'),
+                requests=slow_requests,
+            ),
+            'verify_session': dict(
+                call=lambda: session_client.post('/api/auth/verify-session/'),
+                requests=requests,
+            ),
+            'refresh': dict(call=refresh, requests=requests),
+            'logout': dict(
+                prepare=lambda: logout_client.force_login(user),
+                call=lambda: logout_client.post('/api/auth/logout/'),
+                requests=requests,
+            ),
+            'change_password': dict(call=change_password, requests=slow_requests),
+            'users_list': dict(
+                call=lambda: anon.get('/api/users/'),
+                requests=max(1, requests // 10),
+            ),
+            'users_list_filtered': dict(
+                call=lambda: anon.get('/api/users/', {'is_staff': 'true', 'search': 'user1'}),
+                check=check_filtered,
+                requests=max(1, requests // 10),
+            ),
+            'users_list_fields': dict(
+                call=lambda: anon.get('/api/users/', {'fields': 'id,username,email'}),
+                requests=max(1, requests // 10),
+            ),
+            'metrics': dict(
+                call=lambda: anon.get('/metrics/'),
+                requests=requests,
+            ),
+        }
+        if msgpack is not None:
+            scenarios['users_list_msgpack'] = dict(
+                call=lambda: anon.get('/api/users/', HTTP_ACCEPT='application/msgpack'),
+                requests=max(1, requests // 10),
+            )
+
+        results = {}
+        for name, scenario in scenarios.items():
+            if only and name not in only:
+                continue
+            results[name] = measure(name, **scenario)
+
+        if serialization:
+            for name, result in run_serialization_benchmarks(requests).items():
+                if not only or name in only:
+                    results[name] = result
+        return results
+    finally:
+        views.HR_SERVICE = hr_original
+        server.shutdown()
+
+
+def compare(baseline, results, threshold=0.2):
+    """
+    Bandingkan hasil dengan baseline. Return list pesan regresi (kosong = aman).
+    Latency/throughput boleh meleset `threshold` (0.2 = 20%), jumlah query nggak boleh naik.
+    """
+    regressions = []
+    for name, base in baseline.items():
+        current = results.get(name)
+        if current is None:
+            continue
+
+        if current['p50_ms'] > base['p50_ms'] * (1 + threshold):
+            regressions.append(f"{name}: p50 {base['p50_ms']}ms -> {current['p50_ms']}ms")
+        if current['p99_ms'] > base['p99_ms'] * (1 + threshold):
+            regressions.append(f"{name}: p99 {base['p99_ms']}ms -> {current['p99_ms']}ms")
+        if current['throughput_rps'] < base['throughput_rps'] * (1 - threshold):
+            regressions.append(f"{name}: throughput {base['throughput_rps']} -> {current['throughput_rps']} req/s")
+        if current['queries_per_request'] > base['queries_per_request']:
+            regressions.append(f"{name}: queries/request {base['queries_per_request']} -> {current['queries_per_request']}")
+    return regressions
@@ -0,0 +1,50 @@
+"""
+Benchmark renderer: payload list user asli (UserSerializer, many=True) di-render pakai
+JSONRenderer bawaan DRF vs ORJSONRenderer vs MessagePackRenderer.
+
+Cuma ngukur serialisasi (tanpa DB / HTTP), jadi queries_per_request selalu 0.
+"""
+from time import perf_counter
+
+from django.contrib.auth.models import User
+from rest_framework.renderers import JSONRenderer
+
+from auth.renderers import MessagePackRenderer, ORJSONRenderer, msgpack, orjson
+from auth.serializers import UserSerializer
+
+from .runner import _percentile
+
+
+def _measure_render(renderer, data, requests, warmup=3):
+    for _ in range(warmup):
+        renderer.render(data)
+
+    timings = []
+    for _ in range(requests):
+        start = perf_counter()
+        payload = renderer.render(data)
+        timings.append(perf_counter() - start)
+
+    total = sum(timings)
+    return {
+        'requests': requests,
+        'throughput_rps': round(requests / total, 2),
+        'p50_ms': round(_percentile(timings, 50) * 1000, 3),
+        'p99_ms': round(_percentile(timings, 99) * 1000, 3),
+        'queries_per_request': 0,
+        'payload_bytes': len(payload),
+    }
+
+
+def run_serialization_benchmarks(requests=200):
+    """Pakai user yang sudah di-seed run_benchmarks. Return dict {nama_skenario: hasil}."""
+    users = User.objects.prefetch_related('groups', 'user_permissions')
+    data = UserSerializer(users, many=True).data
+
+    renderers = {'render_json_drf': JSONRenderer()}
+    if orjson is not None:
+        renderers['render_orjson'] = ORJSONRenderer()
+    if msgpack is not None:
+        renderers['render_msgpack'] = MessagePackRenderer()
+
+    return {name: _measure_render(renderer, data, requests) for name, renderer in renderers.items()}
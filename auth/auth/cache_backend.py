@@ -0,0 +1,268 @@
+"""
+Cache dua tingkat: L1 in-process (LRU + TTL) di depan django-redis (L2).
+
+Setiap write/delete lewat cache ini di-broadcast lewat Redis pub/sub supaya worker lain
+membuang key itu dari L1-nya. Kalau pesan pub/sub hilang, data di L1 tetap paling lama
+L1_TTL detik (batas staleness). Selama listener pub/sub putus, L1 di-bypass.
+
+    CACHES = {
+        "default": {
+            "BACKEND": "auth.cache_backend.TwoTierRedisCache",
+            "LOCATION": "redis://127.0.0.1:6379/1",
+            "OPTIONS": {
+                ...,
+                "L1_MAX_ENTRIES": 10000,
+                "L1_TTL": 2,
+                "L1_CHANNEL": "cache:l1:invalidate",
+            }
+        }
+    }
+"""
+import copy
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from time import monotonic, sleep
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django_redis.cache import RedisCache
+from prometheus_client import Counter
+
+CACHE_REQUESTS = Counter('cache_requests_total', 'Cache lookups per tier', ['tier', 'result'])
+
+_MISSING = object()
+
+# Satu L1 per proses (per channel), dipakai bareng semua thread
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+class L1Store:
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.node_id = uuid.uuid4().hex
+        self.healthy = False
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return _MISSING
+            expires_at, value = item
+            if expires_at < monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+        # dict / list dikopi biar caller nggak mengubah isi L1
+        return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def evict(self, keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def handle_message(self, data):
+        message = json.loads(data)
+        if message.get('n') == self.node_id:
+            return
+        if message.get('k') == '*':
+            self.clear()
+        else:
+            self.evict(message.get('k', []))
+
+    def ensure_listener(self, client_factory, channel):
+        # dicek per pid: setelah fork (gunicorn) thread listener nggak ikut
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._data.clear()
+            self.healthy = False
+        threading.Thread(target=self._listen, args=(client_factory, channel), daemon=True).start()
+
+    def _listen(self, client_factory, channel):
+        while True:
+            try:
+                pubsub = client_factory().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(channel)
+                self.healthy = True
+                for message in pubsub.listen():
+                    if message.get('type') == 'message':
+                        self.handle_message(message['data'])
+            except Exception as e:
+                print(f"[WARN] L1 cache invalidation listener disconnected: {e}")
+            self.healthy = False
+            self.clear()
+            sleep(1)
+
+
+class TwoTierRedisCache(RedisCache):
+    def __init__(self, server, params):
+        super().__init__(server, params)
+        options = params.get('OPTIONS', {})
+        self._channel = options.get('L1_CHANNEL', 'cache:l1:invalidate')
+
+        with _stores_lock:
+            store = _stores.get(self._channel)
+            if store is None:
+                store = _stores[self._channel] = L1Store(
+                    max_entries=options.get('L1_MAX_ENTRIES', 10000),
+                    ttl=options.get('L1_TTL', 2),
+                )
+        self._l1 = store
+
+    def _l1_key(self, key, version=None):
+        return str(self.client.make_key(key, version=version))
+
+    def _l1_enabled(self):
+        self._l1.ensure_listener(lambda: self.client.get_client(write=True), self._channel)
+        return self._l1.healthy
+
+    def _invalidate(self, keys):
+        if keys == '*':
+            self._l1.clear()
+        else:
+            self._l1.evict(keys)
+        message = json.dumps({'n': self._l1.node_id, 'k': keys}, separators=(',', ':'))
+        try:
+            self.client.get_client(write=True).publish(self._channel, message)
+        except Exception as e:
+            # worker lain tetap dapat data baru paling lambat L1_TTL detik
+            print(f"[WARN] L1 cache invalidation publish failed: {e}")
+
+    # ---------- read ----------
+
+    def get(self, key, default=None, version=None, client=None):
+        use_l1 = self._l1_enabled()
+        l1_key = self._l1_key(key, version)
+
+        if use_l1:
+            value = self._l1.get(l1_key)
+            if value is not _MISSING:
+                CACHE_REQUESTS.labels(tier='l1', result='hit').inc()
+                return value
+            CACHE_REQUESTS.labels(tier='l1', result='miss').inc()
+
+        value = super().get(key, default=_MISSING, version=version, client=client)
+        if value is _MISSING:
+            CACHE_REQUESTS.labels(tier='l2', result='miss').inc()
+            return default
+
+        CACHE_REQUESTS.labels(tier='l2', result='hit').inc()
+        if use_l1:
+            self._l1.set(l1_key, value)
+            return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+        return value
+
+    def get_many(self, keys, version=None, client=None):
+        keys = list(keys)
+        use_l1 = self._l1_enabled()
+
+        found = {}
+        pending = keys
+        if use_l1:
+            pending = []
+            for key in keys:
+                value = self._l1.get(self._l1_key(key, version))
+                if value is _MISSING:
+                    pending.append(key)
+                else:
+                    found[key] = value
+            CACHE_REQUESTS.labels(tier='l1', result='hit').inc(len(found))
+            CACHE_REQUESTS.labels(tier='l1', result='miss').inc(len(pending))
+
+        if pending:
+            fetched = super().get_many(pending, version=version, client=client)
+            CACHE_REQUESTS.labels(tier='l2', result='hit').inc(len(fetched))
+            CACHE_REQUESTS.labels(tier='l2', result='miss').inc(len(pending) - len(fetched))
+            if use_l1:
+                for key, value in fetched.items():
+                    self._l1.set(self._l1_key(key, version), value)
+                fetched = {key: copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+                           for key, value in fetched.items()}
+            found.update(fetched)
+
+        return found
+
+    # ---------- write (selalu invalidasi L1 semua worker) ----------
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, **kwargs):
+        result = super().set(key, value, timeout=timeout, version=version, **kwargs)
+        self._invalidate([self._l1_key(key, version)])
+        return result
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, **kwargs):
+        result = super().add(key, value, timeout=timeout, version=version, **kwargs)
+        if result:
+            self._invalidate([self._l1_key(key, version)])
+        return result
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None, **kwargs):
+        result = super().set_many(data, timeout=timeout, version=version, **kwargs)
+        self._invalidate([self._l1_key(key, version) for key in data])
+        return result
+
+    def delete(self, key, version=None, **kwargs):
+        result = super().delete(key, version=version, **kwargs)
+        self._invalidate([self._l1_key(key, version)])
+        return result
+
+    def delete_many(self, keys, version=None, **kwargs):
+        keys = list(keys)
+        result = super().delete_many(keys, version=version, **kwargs)
+        self._invalidate([self._l1_key(key, version) for key in keys])
+        return result
+
+    def incr(self, key, delta=1, version=None, **kwargs):
+        result = super().incr(key, delta=delta, version=version, **kwargs)
+        self._invalidate([self._l1_key(key, version)])
+        return result
+
+    def decr(self, key, delta=1, version=None, **kwargs):
+        result = super().decr(key, delta=delta, version=version, **kwargs)
+        self._invalidate([self._l1_key(key, version)])
+        return result
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None, **kwargs):
+        result = super().touch(key, timeout=timeout, version=version, **kwargs)
+        self._invalidate([self._l1_key(key, version)])
+        return result
+
+    def expire(self, key, timeout, version=None, **kwargs):
+        result = super().expire(key, timeout, version=version, **kwargs)
+        self._invalidate([self._l1_key(key, version)])
+        return result
+
+    def persist(self, key, version=None, **kwargs):
+        result = super().persist(key, version=version, **kwargs)
+        self._invalidate([self._l1_key(key, version)])
+        return result
+
+    def delete_pattern(self, *args, **kwargs):
+        result = super().delete_pattern(*args, **kwargs)
+        self._invalidate('*')
+        return result
+
+    def clear(self):
+        result = super().clear()
+        self._invalidate('*')
+        return result
@@ -0,0 +1,124 @@
+"""
+Claim otorisasi yang ditanam di internal token, biar service lain nggak perlu call balik
+buat cek superuser / group / permission.
+
+Format (key pendek biar token kecil):
+    v   : versi format claim
+    gen : generasi claim (naik setiap permission group berubah)
+    su  : is_superuser
+    st  : is_staff
+    a   : is_active (refresh token ditolak kalau False)
+    g   : nama group
+    p   : permission "app_label.codename"  (atau)
+    pb  : bitset permission, bit ke-n = Permission.id n (base64url, little endian)
+    trunc: True kalau permission kepotong karena AUTH_CLAIMS_MAX_BYTES (downstream harus call balik)
+"""
+import base64
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.db.models import Q
+
+CLAIMS_VERSION = 2
+CLAIMS_KEY = "claims:user:{user_id}"
+GENERATION_KEY = "claims:generation"
+
+
+def _cache_key(user_id):
+    return CLAIMS_KEY.format(user_id=user_id)
+
+
+def encode_bitset(ids):
+    mask = 0
+    for pk in ids:
+        mask |= 1 << pk
+    raw = mask.to_bytes((mask.bit_length() + 7) // 8, 'little')
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def _size(claims):
+    return len(json.dumps(claims, separators=(',', ':')))
+
+
+def build_claims(user, generation=0):
+    # Selalu dari primary: claim di-cache sampai AUTH_CLAIMS_CACHE_TIMEOUT, kalau dibangun dari
+    # replica yang lag, permission yang baru dicabut bisa ke-cache lagi selama itu
+    claims = {
+        'v': CLAIMS_VERSION,
+        'gen': generation,
+        'su': user.is_superuser,
+        'st': user.is_staff,
+        'a': user.is_active,
+        'g': sorted(user.groups.using('default').values_list('name', flat=True)),
+    }
+
+    # superuser otomatis punya semua permission, nggak perlu dikirim
+    if user.is_superuser or not user.is_active:
+        return claims
+
+    permissions = (
+        Permission.objects.using('default')
+        .filter(Q(user=user) | Q(group__user=user))
+        .values_list('id', 'content_type__app_label', 'codename')
+        .distinct()
+    )
+    ids, names = [], []
+    for pk, app_label, codename in permissions:
+        ids.append(pk)
+        names.append(f"{app_label}.{codename}")
+
+    max_bytes = getattr(settings, 'AUTH_CLAIMS_MAX_BYTES', 2048)
+
+    if not getattr(settings, 'AUTH_CLAIMS_PERMISSION_BITSET', False):
+        claims['p'] = sorted(names)
+        if _size(claims) <= max_bytes:
+            return claims
+        del claims['p']
+
+    # daftar nama kebesaran (atau memang mode bitset)
+    if ids:
+        claims['pb'] = encode_bitset(ids)
+    if _size(claims) > max_bytes:
+        claims.pop('pb', None)
+        claims['trunc'] = True
+
+    return claims
+
+
+def get_claims_by_id(user_id):
+    """
+    Claim dari cache (1x round trip buat generasi + claim), build ulang kalau belum ada
+    atau generasinya sudah lewat. Kalau miss, User di-load ulang dari primary.
+    Raise User.DoesNotExist kalau user-nya sudah dihapus.
+    """
+    key = _cache_key(user_id)
+    cached = cache.get_many([GENERATION_KEY, key])
+    generation = cached.get(GENERATION_KEY) or 0
+
+    claims = cached.get(key)
+    if claims is not None and claims.get('gen') == generation and claims.get('v') == CLAIMS_VERSION:
+        return claims
+
+    user = User.objects.using('default').get(pk=user_id)
+    claims = build_claims(user, generation=generation)
+    cache.set(key, claims, timeout=getattr(settings, 'AUTH_CLAIMS_CACHE_TIMEOUT', 3600))
+    return claims
+
+
+def get_claims(user):
+    # `user` bisa hasil baca replica (login / verify-session), jadi nggak dipakai buat build
+    return get_claims_by_id(user.pk)
+
+
+def invalidate_claims(user_ids):
+    user_ids = list(user_ids)
+    if user_ids:
+        cache.delete_many([_cache_key(user_id) for user_id in user_ids])
+
+
+def bump_generation():
+    """Invalidasi claim semua user sekaligus (mis. permission sebuah group berubah)."""
+    cache.add(GENERATION_KEY, 0, timeout=None)
+    cache.incr(GENERATION_KEY)
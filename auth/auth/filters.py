@@ -3,7 +3,13 @@ from django.contrib.auth.models import User
 from .config import *
 
 class UserFilter(BaseFilter):
-    id__in = django_filters.CharFilter(field_name='id', lookup_expr='in')
+    id__in = NumberInFilter(field_name='id', lookup_expr='in')
+
+    # User bukan model soft-delete: is_active ya kolom is_active, filter audit BaseFilter nggak berlaku
+    is_active = django_filters.BooleanFilter(field_name='is_active')
+    created_by = deleted_by = None
+    created_at = created_at__gte = created_at__lte = None
+    deleted_at = deleted_at__gte = deleted_at__lte = None
     
     class Meta:
         model = User
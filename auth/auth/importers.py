@@ -0,0 +1,176 @@
+from pathlib import Path
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
+
+import pandas as pd
+
+from .claims import invalidate_claims
+from .serializers import UserImportSerializer
+from .refresh_tokens import revoke_user_refresh_tokens
+from .session_index import revoke_user_sessions
+from .user_resolve import invalidate_users
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+# Kolom yang boleh di-import dari file HR (selain ini di-skip)
+IMPORT_FIELDS = ('username', 'email', 'first_name', 'last_name', 'is_active', 'is_staff', 'raw_password')
+
+
+def iter_user_chunks(file, filename, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Baca file CSV / Excel per chunk, yield (columns, rows).
+    Memory cuma sebesar satu chunk, file-nya sendiri nggak pernah di-load utuh.
+    """
+    suffix = Path(filename or '').suffix.lower()
+
+    if suffix in ('.xlsx', '.xlsm'):
+        # pd.read_excel nggak support chunksize, jadi pakai openpyxl read-only (streaming)
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            columns = [str(col).strip() if col is not None else '' for col in header]
+
+            chunk = []
+            for values in rows:
+                chunk.append({col: ('' if val is None else str(val)) for col, val in zip(columns, values)})
+                if len(chunk) >= chunk_size:
+                    yield columns, chunk
+                    chunk = []
+            if chunk:
+                yield columns, chunk
+        finally:
+            workbook.close()
+        return
+
+    if suffix not in ('.csv', ''):
+        raise ValueError(f"Unsupported file type '{suffix}', use .csv or .xlsx")
+
+    reader = pd.read_csv(file, chunksize=chunk_size, dtype=str, keep_default_na=False)
+    for frame in reader:
+        frame.columns = [str(col).strip() for col in frame.columns]
+        yield list(frame.columns), frame.to_dict('records')
+
+
+def _upsert_users(users, update_fields):
+    if not users:
+        return
+
+    # MySQL nggak terima unique_fields (ON DUPLICATE KEY pakai semua unique index)
+    unique_fields = ['username'] if connection.features.supports_update_conflicts_with_target else None
+
+    User.objects.bulk_create(
+        users,
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=update_fields,
+    )
+
+
+def import_users(file, filename, chunk_size=DEFAULT_CHUNK_SIZE, on_progress=None):
+    """
+    Import / upsert user berdasarkan username.
+
+    Kolom yang ada di file dianggap sumber kebenaran: user yang sudah ada di-update
+    untuk kolom yang diisi di barisnya saja (cell kosong = nilai lama dipertahankan,
+    buat user baru pakai default model). Password cuma di-set kalau kolom `raw_password` diisi
+    (hashing PBKDF2 per baris, jadi file besar dengan password bakal lama).
+    Baris dengan username dobel di chunk yang sama: yang terakhir yang dipakai.
+    """
+    summary = {
+        'total_rows': 0,
+        'imported': 0,
+        'created': 0,
+        'updated': 0,
+        'failed': 0,
+        'chunks': 0,
+        'errors': [],
+        'errors_truncated': False,
+    }
+
+    row_number = 1  # baris 1 = header
+    for columns, rows in iter_user_chunks(file, filename, chunk_size=chunk_size):
+        if 'username' not in columns:
+            raise ValueError("Column 'username' is required")
+
+        known_columns = [col for col in columns if col in IMPORT_FIELDS]
+
+        valid = {}
+        for row in rows:
+            row_number += 1
+            data = {col: row[col] for col in known_columns if row.get(col) not in ('', None)}
+
+            serializer = UserImportSerializer(data=data)
+            if not serializer.is_valid():
+                summary['failed'] += 1
+                if len(summary['errors']) < MAX_REPORTED_ERRORS:
+                    summary['errors'].append({'row': row_number, 'username': data.get('username'), 'errors': serializer.errors})
+                else:
+                    summary['errors_truncated'] = True
+                continue
+
+            valid[serializer.validated_data['username']] = serializer.validated_data
+
+        # user lama yang dinonaktifkan atau password-nya diganti -> session & refresh token di-revoke
+        existing, revoke = {}, []
+        for username, pk, is_active in User.objects.filter(username__in=list(valid)).values_list('username', 'id', 'is_active'):
+            existing[username] = pk
+            attrs = valid[username]
+            if (is_active and attrs.get('is_active') is False) or attrs.get('raw_password'):
+                revoke.append(pk)
+        now = timezone.now()
+
+        # Dikelompokkan per set kolom yang diisi, biar cell kosong nggak menimpa data lama
+        # (mis. is_active kosong nggak mengaktifkan lagi user yang sudah dinonaktifkan)
+        groups = {}
+        for username, attrs in valid.items():
+            attrs = dict(attrs)
+            raw_password = attrs.pop('raw_password', None)
+            user = User(date_joined=now, **attrs)
+            update_fields = sorted(field for field in attrs if field != 'username')
+            if raw_password:
+                user.password = make_password(raw_password)
+                update_fields.append('password')
+            else:
+                user.set_unusable_password()
+            groups.setdefault(tuple(update_fields), []).append(user)
+
+        with transaction.atomic():
+            for update_fields, users in groups.items():
+                # tanpa kolom yang diisi, user lama nggak diubah (update username ke dirinya sendiri)
+                _upsert_users(users, list(update_fields) or ['username'])
+
+        # bulk_create nggak kirim signal, cache resolve & claim (is_staff / is_active) user yang di-update dihapus manual
+        invalidate_users(existing.values())
+        invalidate_claims(existing.values())
+
+        # receiver revoke_sessions_on_deactivate juga nggak jalan (dan ganti password lewat import
+        # nggak lewat change-password), jadi session & refresh token-nya dihapus di sini
+        for pk in revoke:
+            try:
+                revoke_user_sessions(pk)
+            except Exception as e:
+                print(f"[WARN] session_index.revoke_user_sessions({pk}) failed: {e}")
+            try:
+                revoke_user_refresh_tokens(pk)
+            except Exception as e:
+                print(f"[WARN] refresh_tokens.revoke_user_refresh_tokens({pk}) failed: {e}")
+
+        summary['chunks'] += 1
+        summary['total_rows'] = row_number - 1
+        summary['imported'] += len(valid)
+        summary['updated'] += len(existing)
+        summary['created'] += len(valid) - len(existing)
+
+        if on_progress:
+            on_progress(summary)
+
+    return summary
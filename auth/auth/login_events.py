@@ -0,0 +1,157 @@
+"""
+Write-behind last_login & audit login/logout (aktif kalau LOGIN_WRITE_BEHIND = True).
+
+login() nggak lagi UPDATE auth_user secara sinkron: timestamp & event di-buffer di Redis,
+lalu `python manage.py flush_login_events --loop` menulisnya per batch (bulk_update / bulk_create)
+paling lambat tiap LOGIN_EVENTS_FLUSH_INTERVAL detik.
+
+Delivery at-least-once: data di-rename (RENAMENX) ke key `:processing` sebelum ditulis dan baru
+dihapus setelah commit. Kalau worker mati di tengah jalan, run berikutnya memproses ulang key itu
+(last_login idempoten, event di-dedupe lewat event_id). Satu flush jalan dalam satu waktu
+(lock di Redis), jadi worker yang dobel nggak saling hapus `:processing` milik yang lain.
+"""
+import datetime
+import json
+import uuid
+from time import time
+
+from django.contrib.auth.models import User, update_last_login
+from django.db import transaction
+from django_redis import get_redis_connection
+from redis.exceptions import ResponseError
+
+from .accounts.models import LoginEvent
+from .session_index import session_user_id
+
+LAST_LOGIN_KEY = "login:last_login"
+EVENTS_KEY = "login:events"
+LOCK_KEY = "login:flush:lock"
+LOCK_TIMEOUT = 300  # detik, jauh di atas durasi satu flush
+BATCH_SIZE = 500
+
+# Lepas lock cuma kalau masih milik kita (lock bisa sudah expire & diambil worker lain)
+_RELEASE = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _redis():
+    return get_redis_connection("default")
+
+
+def _event(event, user_id, request):
+    meta = getattr(request, 'META', {}) if request is not None else {}
+    return json.dumps({
+        'id': uuid.uuid4().hex,
+        'user_id': user_id,
+        'event': event,
+        'ip': meta.get('REMOTE_ADDR'),
+        'ua': meta.get('HTTP_USER_AGENT', '')[:255],
+        'ts': time(),
+    }, separators=(',', ':'))
+
+
+def record_login(sender, request, user, **kwargs):
+    """Pengganti django.contrib.auth.models.update_last_login."""
+    now = time()
+    # response login tetap nampilin last_login terbaru
+    user.last_login = datetime.datetime.fromtimestamp(now, tz=datetime.timezone.utc)
+
+    try:
+        pipe = _redis().pipeline()
+        pipe.hset(LAST_LOGIN_KEY, user.pk, now)
+        pipe.rpush(EVENTS_KEY, _event(LoginEvent.LOGIN, user.pk, request))
+        pipe.execute()
+    except Exception as e:
+        # Redis down -> balik ke UPDATE sinkron, jangan sampai last_login hilang
+        print(f"[WARN] login write-behind failed, updating last_login synchronously: {e}")
+        update_last_login(sender, user)
+
+
+def record_logout(sender, request, user, **kwargs):
+    user_id = session_user_id(request, user)
+    if user_id is None:
+        return
+    try:
+        _redis().rpush(EVENTS_KEY, _event(LoginEvent.LOGOUT, user_id, request))
+    except Exception as e:
+        print(f"[WARN] logout audit event dropped: {e}")
+
+
+def _claim(redis, key):
+    """
+    Pindahkan key ke `<key>:processing` (atomic). Sisa dari flush yang gagal diproses duluan:
+    RENAMENX nggak menimpa `:processing` yang belum selesai ditulis.
+    """
+    processing = f"{key}:processing"
+    try:
+        redis.renamenx(key, processing)
+    except ResponseError:
+        # key belum ada, mungkin masih ada sisa `:processing`
+        pass
+    return processing if redis.exists(processing) else None
+
+
+def _to_datetime(ts):
+    return datetime.datetime.fromtimestamp(float(ts), tz=datetime.timezone.utc)
+
+
+def flush_last_login(redis):
+    processing = _claim(redis, LAST_LOGIN_KEY)
+    if processing is None:
+        return 0
+
+    pending = redis.hgetall(processing)
+    users = [User(pk=int(user_id), last_login=_to_datetime(ts)) for user_id, ts in pending.items()]
+    with transaction.atomic():
+        User.objects.bulk_update(users, ['last_login'], batch_size=BATCH_SIZE)
+
+    redis.delete(processing)
+    return len(users)
+
+
+def flush_events(redis):
+    processing = _claim(redis, EVENTS_KEY)
+    if processing is None:
+        return 0
+
+    total = 0
+    start = 0
+    while True:
+        raw = redis.lrange(processing, start, start + BATCH_SIZE - 1)
+        if not raw:
+            break
+
+        events = []
+        for item in raw:
+            data = json.loads(item)
+            events.append(LoginEvent(
+                event_id=data['id'],
+                user_id=data['user_id'],
+                event=data['event'],
+                ip_address=data['ip'] or None,
+                user_agent=data['ua'],
+                created_at=_to_datetime(data['ts']),
+            ))
+        LoginEvent.objects.bulk_create(events, ignore_conflicts=True)
+
+        total += len(events)
+        start += BATCH_SIZE
+
+    redis.delete(processing)
+    return total
+
+
+def flush():
+    """Return (jumlah last_login, jumlah event) yang ditulis. (0, 0) kalau flush lain lagi jalan."""
+    redis = _redis()
+    token = uuid.uuid4().hex
+    if not redis.set(LOCK_KEY, token, nx=True, ex=LOCK_TIMEOUT):
+        return 0, 0
+    try:
+        return flush_last_login(redis), flush_events(redis)
+    finally:
+        redis.register_script(_RELEASE)(keys=[LOCK_KEY], args=[token])
@@ -1,9 +1,21 @@
-from time import time
+import random
+import re
+from collections import Counter as ShapeCounter
+from contextlib import ExitStack
+from time import time, perf_counter
+
+from django.conf import settings
+from django.db import connections
 from prometheus_client import Counter, Histogram
 
 REQUEST_COUNT = Counter('request_count', 'Total request count', ['method', 'endpoint'])
 REQUEST_DURATION = Histogram('request_duration_seconds', 'Request duration in seconds', ['method', 'endpoint'])
 
+SQL_QUERY_COUNT = Histogram('request_sql_queries', 'SQL queries per request', ['method', 'route'],
+                            buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 500))
+SQL_QUERY_DURATION = Histogram('request_sql_duration_seconds', 'Total SQL time per request in seconds', ['method', 'route'])
+SQL_N_PLUS_ONE = Counter('request_sql_n_plus_one_total', 'Requests with a repeated query shape (likely N+1)', ['method', 'route'])
+
 class PrometheusMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -19,4 +31,68 @@ class PrometheusMiddleware:
         REQUEST_COUNT.labels(method=request.method, endpoint=request.path).inc()
         REQUEST_DURATION.labels(method=request.method, endpoint=request.path).observe(time() - start_time)
 
-        return response
\ No newline at end of file
+        return response
+
+# Bentuk query: IN (%s, %s, ...) disamakan & angka literal diganti ? biar query yang sama cuma beda id kehitung satu shape
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+_NUMBER = re.compile(r"\b\d+\b")
+
+def query_shape(sql):
+    return _NUMBER.sub('?', _IN_LIST.sub('IN (...)', sql))
+
+class QueryStats:
+    """
+    Dipasang lewat connection.execute_wrapper, hitung jumlah query, total waktu SQL & shape-nya.
+    """
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = ShapeCounter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += perf_counter() - start
+            self.shapes[query_shape(sql)] += 1
+
+    def repeated_shapes(self, threshold):
+        return {shape: n for shape, n in self.shapes.items() if n >= threshold}
+
+class SQLInstrumentationMiddleware:
+    """
+    Catat jumlah query & waktu SQL per route ke Prometheus, dan tandai kemungkinan N+1
+    (shape query yang sama muncul >= SQL_N_PLUS_ONE_THRESHOLD kali di satu request).
+    Cuma sebagian request yang di-sample (SQL_INSTRUMENTATION_SAMPLE_RATE).
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'SQL_INSTRUMENTATION_SAMPLE_RATE', 0.05)
+        self.threshold = getattr(settings, 'SQL_N_PLUS_ONE_THRESHOLD', 10)
+
+    def __call__(self, request):
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        stats = QueryStats()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+
+        # pakai pola route (bukan path) biar label Prometheus nggak meledak
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match else 'unresolved'
+
+        SQL_QUERY_COUNT.labels(method=request.method, route=route).observe(stats.count)
+        SQL_QUERY_DURATION.labels(method=request.method, route=route).observe(stats.duration)
+
+        repeated = stats.repeated_shapes(self.threshold)
+        if repeated:
+            SQL_N_PLUS_ONE.labels(method=request.method, route=route).inc()
+            shape, n = max(repeated.items(), key=lambda item: item[1])
+            print(f"[WARN] Possible N+1 on {request.method} {route}: {n}x {shape[:200]}")
+
+        return response
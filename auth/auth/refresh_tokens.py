@@ -0,0 +1,171 @@
+"""
+Refresh token berotasi buat perpanjang internal token tanpa login ulang.
+
+Format token: "<family>.<secret>". Di Redis cuma disimpan satu key per family:
+
+    refresh:family:<family> -> "<user_id>|<sha256(secret)[:32]>"   (TTL = umur family)
+    refresh:user:<user_id>  -> SET family milik user (buat revoke semua)
+
+Setiap refresh, secret diganti (compare-and-swap atomic lewat Lua). Kalau secret lama dipakai
+lagi berarti token bocor / di-replay: seluruh family langsung di-revoke, termasuk token
+terbaru yang dipegang pihak lain. Umur family absolut (KEEPTTL), rotasi nggak memperpanjang.
+"""
+import hashlib
+import re
+import secrets
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+FAMILY_KEY = "refresh:family:{family}"
+USER_KEY = "refresh:user:{user_id}"
+
+# family = secrets.token_urlsafe(12), secret = secrets.token_urlsafe(24) (base64url)
+FAMILY_RE = re.compile(r'[A-Za-z0-9_-]{16}')
+SECRET_RE = re.compile(r'[A-Za-z0-9_-]{32}')
+
+# Kalau index user sudah sebesar ini, buang family yang sudah expired
+PRUNE_THRESHOLD = 50
+
+# KEYS[1] = refresh:family:<family>, ARGV = digest lama, digest baru
+# return {1, user_id} = OK, {0, user_id} = reuse (family dihapus), nil = nggak ada / expired
+_ROTATE = """
+local value = redis.call('GET', KEYS[1])
+if not value then
+    return nil
+end
+local sep = string.find(value, '|', 1, true)
+local user_id = tonumber(string.sub(value, 1, sep - 1))
+if string.sub(value, sep + 1) ~= ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return {0, user_id}
+end
+redis.call('SET', KEYS[1], user_id .. '|' .. ARGV[2], 'KEEPTTL')
+return {1, user_id}
+"""
+
+
+class RefreshTokenError(Exception):
+    pass
+
+
+class RefreshTokenReused(RefreshTokenError):
+    def __init__(self, user_id):
+        super().__init__(f"Refresh token reused for user {user_id}")
+        self.user_id = user_id
+
+
+def _redis():
+    return get_redis_connection("default")
+
+
+def _lifetime():
+    return getattr(settings, 'REFRESH_TOKEN_LIFETIME', 60 * 60 * 24 * 14)
+
+
+def _digest(secret):
+    return hashlib.sha256(secret.encode()).hexdigest()[:32]
+
+
+def _split(token):
+    if not isinstance(token, str):
+        raise RefreshTokenError("Malformed refresh token")
+    family, _, secret = token.partition('.')
+    if not FAMILY_RE.fullmatch(family) or not SECRET_RE.fullmatch(secret):
+        raise RefreshTokenError("Malformed refresh token")
+    return family, secret
+
+
+def issue_refresh_token(user_id):
+    family = secrets.token_urlsafe(12)
+    secret = secrets.token_urlsafe(24)
+    lifetime = _lifetime()
+    user_key = USER_KEY.format(user_id=user_id)
+
+    pipe = _redis().pipeline()
+    pipe.set(FAMILY_KEY.format(family=family), f"{user_id}|{_digest(secret)}", ex=lifetime)
+    pipe.sadd(user_key, family)
+    pipe.expire(user_key, lifetime)
+    pipe.scard(user_key)
+    size = pipe.execute()[-1]
+
+    if size > PRUNE_THRESHOLD:
+        prune_families(user_id)
+    return f"{family}.{secret}"
+
+
+def rotate_refresh_token(token):
+    """
+    Tukar refresh token dengan yang baru. Return (user_id, token_baru).
+    Raise RefreshTokenError kalau token nggak valid / expired / sudah di-revoke,
+    RefreshTokenReused kalau secret lama dipakai ulang.
+    """
+    family, secret = _split(token)
+    new_secret = secrets.token_urlsafe(24)
+
+    redis = _redis()
+    result = redis.register_script(_ROTATE)(
+        keys=[FAMILY_KEY.format(family=family)],
+        args=[_digest(secret), _digest(new_secret)],
+    )
+    if result is None:
+        raise RefreshTokenError("Invalid or expired refresh token")
+
+    ok, user_id = result
+    if not ok:
+        redis.srem(USER_KEY.format(user_id=user_id), family)
+        raise RefreshTokenReused(user_id)
+    return user_id, f"{family}.{new_secret}"
+
+
+def revoke_refresh_token(token):
+    """Revoke satu family (logout). Token yang nggak valid diabaikan."""
+    try:
+        family, secret = _split(token)
+    except RefreshTokenError:
+        return False
+
+    redis = _redis()
+    key = FAMILY_KEY.format(family=family)
+    value = redis.get(key)
+    if value is None:
+        return False
+
+    user_id, _, digest = value.decode().partition('|')
+    if not secrets.compare_digest(digest, _digest(secret)):
+        return False
+
+    pipe = redis.pipeline()
+    pipe.delete(key)
+    pipe.srem(USER_KEY.format(user_id=user_id), family)
+    pipe.execute()
+    return True
+
+
+def get_families(user_id):
+    return {member.decode() for member in _redis().smembers(USER_KEY.format(user_id=user_id))}
+
+
+def prune_families(user_id):
+    redis = _redis()
+    families = list(get_families(user_id))
+    pipe = redis.pipeline()
+    for family in families:
+        pipe.exists(FAMILY_KEY.format(family=family))
+    stale = [family for family, exists in zip(families, pipe.execute()) if not exists]
+    if stale:
+        redis.srem(USER_KEY.format(user_id=user_id), *stale)
+    return len(stale)
+
+
+def revoke_user_refresh_tokens(user_id):
+    """Hapus semua refresh token milik user, return jumlah family yang di-revoke."""
+    redis = _redis()
+    families = get_families(user_id)
+
+    pipe = redis.pipeline()
+    for family in families:
+        pipe.delete(FAMILY_KEY.format(family=family))
+    pipe.delete(USER_KEY.format(user_id=user_id))
+    revoked = pipe.execute()[:-1]
+    return sum(revoked)
@@ -0,0 +1,74 @@
+"""
+Renderer & parser cepat buat traffic API internal.
+
+- application/json    -> orjson (fallback ke JSONRenderer/JSONParser bawaan DRF kalau orjson nggak ada)
+- application/msgpack -> MessagePack (butuh paket msgpack)
+
+Dipilih otomatis dari header Accept / Content-Type.
+"""
+from rest_framework import renderers, parsers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Tipe yang nggak dikenal orjson / msgpack (Decimal, lazy string, UUID, QuerySet, ...) pakai encoder DRF
+_drf_default = JSONEncoder().default
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b''
+
+        # OPT_NON_STR_KEYS: map dengan key int (mis. /api/users/resolve/)
+        option = orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_drf_default, option=option)
+
+
+class ORJSONParser(parsers.JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_drf_default, use_bin_type=True)
+
+
+class MessagePackParser(parsers.BaseParser):
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, strict_map_key=False)
+        except Exception as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
@@ -0,0 +1,186 @@
+"""
+Read replica router.
+
+Read dari view yang terdaftar di DATABASE_REPLICA_VIEWS diarahkan ke salah satu replica
+(DATABASE_REPLICAS). Setelah request user benar-benar write ke primary
+(ditandai db_for_write), request user itu berikutnya di-pin ke primary selama REPLICA_PIN_SECONDS
+(read-your-writes). Replica yang lag-nya > REPLICA_MAX_LAG_SECONDS di-skip.
+
+Buat test lokal cukup dua database SQLite:
+
+    DATABASES = {
+        'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': 'primary.sqlite3'},
+        'replica': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': 'replica.sqlite3',
+                    'TEST': {'MIRROR': 'default'}},
+    }
+"""
+import random
+from contextvars import ContextVar
+from hashlib import sha1
+from time import monotonic
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.db import connections
+
+PIN_KEY = "db:pin:{identity}"
+
+# True = request ini boleh baca dari replica (di-set ReplicaRoutingMiddleware)
+_use_replica = ContextVar('use_replica', default=False)
+
+# {'wrote': bool} per request, ditandai db_for_write. None = di luar request (command, shell)
+_write_state = ContextVar('write_state', default=None)
+
+# {alias: (waktu_cek, lag_detik)}
+_lag_cache = {}
+
+
+def get_replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def _query_lag(alias):
+    connection = connections[alias]
+    if connection.vendor != 'mysql':
+        return 0
+
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute("SHOW REPLICA STATUS")
+            column = 'Seconds_Behind_Source'
+        except Exception:
+            # MySQL < 8.0.22
+            cursor.execute("SHOW SLAVE STATUS")
+            column = 'Seconds_Behind_Master'
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        status = dict(zip([col[0] for col in cursor.description], row))
+    return status.get(column)
+
+
+def replica_lag(alias):
+    """
+    Lag replica dalam detik (di-cache REPLICA_LAG_CHECK_INTERVAL detik).
+    None = replikasi mati / nggak bisa dicek.
+    """
+    interval = getattr(settings, 'REPLICA_LAG_CHECK_INTERVAL', 5)
+    checked_at, lag = _lag_cache.get(alias, (None, None))
+    if checked_at is not None and monotonic() - checked_at < interval:
+        return lag
+
+    try:
+        lag = _query_lag(alias)
+    except Exception as e:
+        print(f"[WARN] replica_lag({alias}) failed: {e}")
+        lag = None
+
+    _lag_cache[alias] = (monotonic(), lag)
+    return lag
+
+
+def healthy_replicas():
+    max_lag = getattr(settings, 'REPLICA_MAX_LAG_SECONDS', 2)
+    healthy = []
+    for alias in get_replicas():
+        lag = replica_lag(alias)
+        if lag is not None and lag <= max_lag:
+            healthy.append(alias)
+    return healthy
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _use_replica.get():
+            return None
+
+        replicas = healthy_replicas()
+        if not replicas:
+            return 'default'
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _write_state.get()
+        if state is not None:
+            state['wrote'] = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # primary & replica isinya sama
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+def _identities(request, include_user=False):
+    """
+    Identitas buat pin: user id dari session dan/atau hash header Authorization (token).
+    Dua-duanya bisa dibaca tanpa query ke database. `include_user` juga ambil request.user
+    (dipakai setelah response, waktu user sudah di-resolve oleh view).
+    """
+    identities = []
+
+    session = getattr(request, 'session', None)
+    uid = session.get(SESSION_KEY) if session is not None else None
+    if uid:
+        identities.append(f"user:{uid}")
+
+    user = getattr(request, 'user', None) if include_user else None
+    if user is not None and user.is_authenticated and f"user:{user.pk}" not in identities:
+        identities.append(f"user:{user.pk}")
+
+    authorization = request.META.get('HTTP_AUTHORIZATION')
+    if authorization:
+        identities.append("auth:" + sha1(authorization.encode()).hexdigest())
+
+    return identities
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Tandai request yang boleh baca dari replica, dan pin user ke primary setelah write.
+    POST yang cuma baca (verify-session, resolve) nggak nge-pin.
+    Harus dipasang setelah SessionMiddleware & AuthenticationMiddleware.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not get_replicas():
+            return self.get_response(request)
+
+        state = {'wrote': False}
+        replica_token = _use_replica.set(False)
+        write_token = _write_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _use_replica.reset(replica_token)
+            _write_state.reset(write_token)
+
+        if state['wrote'] and response.status_code < 400:
+            self.pin(request)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not get_replicas():
+            return None
+
+        match = getattr(request, 'resolver_match', None)
+        methods = getattr(settings, 'DATABASE_REPLICA_VIEWS', {}).get(match.url_name if match else None)
+        if methods and request.method in methods and not self.is_pinned(request):
+            _use_replica.set(True)
+        return None
+
+    def pin(self, request):
+        seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+        identities = _identities(request, include_user=True)
+        if identities:
+            cache.set_many({PIN_KEY.format(identity=identity): 1 for identity in identities}, timeout=seconds)
+
+    def is_pinned(self, request):
+        keys = [PIN_KEY.format(identity=identity) for identity in _identities(request)]
+        return bool(keys) and bool(cache.get_many(keys))
@@ -1,4 +1,5 @@
 from django.contrib.auth.models import User
+from django.contrib.auth.validators import UnicodeUsernameValidator
 from rest_framework import serializers
 from .config import fetch_external_data
 
@@ -53,6 +54,16 @@ class UserSerializer(DynamicModelSerializer):
             data.pop('password', None)
 
         return data
+
+class UserImportSerializer(UserSerializer):
+    """
+    Validasi per baris buat import user. Username nggak dicek unique karena di-upsert.
+    """
+    raw_password = serializers.CharField(write_only=True, required=False)
+    class Meta:
+        model = User
+        fields = ['username', 'email', 'first_name', 'last_name', 'is_active', 'is_staff', 'raw_password']
+        extra_kwargs = {'username': {'validators': [UnicodeUsernameValidator()]}}
     
 class GitSerializer(serializers.Serializer):
     username = serializers.CharField()
@@ -0,0 +1,92 @@
+"""
+Session engine di atas cache django-redis.
+
+SESSION_WRITE_THROUGH = False -> session cuma di Redis (paling cepat).
+SESSION_WRITE_THROUGH = True  -> cached_db: tulis ke Redis + django_session, baca dari Redis dulu.
+"""
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.sessions.backends import cache as cache_backend
+from django.contrib.sessions.backends import cached_db as cached_db_backend
+
+# Key bawaan django.contrib.auth disingkat biar payload di Redis kecil
+COMPACT_KEYS = {
+    SESSION_KEY: '~u',
+    BACKEND_SESSION_KEY: '~b',
+    HASH_SESSION_KEY: '~h',
+}
+EXPANDED_KEYS = {short: key for key, short in COMPACT_KEYS.items()}
+
+
+def _default_backend():
+    backends = getattr(settings, 'AUTHENTICATION_BACKENDS', None) or ['django.contrib.auth.backends.ModelBackend']
+    return backends[0]
+
+
+def pack_session(data):
+    packed = {}
+    for key, value in data.items():
+        # backend default nggak perlu disimpan, di-restore waktu unpack
+        if key == BACKEND_SESSION_KEY and value == _default_backend():
+            continue
+        packed[COMPACT_KEYS.get(key, key)] = value
+    return packed
+
+
+def unpack_session(data):
+    if not isinstance(data, dict):
+        return data
+
+    session = {EXPANDED_KEYS.get(key, key): value for key, value in data.items()}
+    if SESSION_KEY in session and BACKEND_SESSION_KEY not in session:
+        session[BACKEND_SESSION_KEY] = _default_backend()
+    return session
+
+
+class CompactSessionCache:
+    """
+    Bungkus cache backend: pack waktu set/add, unpack waktu get.
+    Data lama (belum di-pack) tetap kebaca karena unpack cuma mengganti key yang dikenal.
+    """
+    def __init__(self, cache):
+        self._cache = cache
+
+    def __getattr__(self, name):
+        return getattr(self._cache, name)
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    def get(self, key, default=None):
+        return unpack_session(self._cache.get(key, default))
+
+    def set(self, key, value, timeout=None):
+        return self._cache.set(key, pack_session(value), timeout)
+
+    def add(self, key, value, timeout=None):
+        return self._cache.add(key, pack_session(value), timeout)
+
+    async def aget(self, key, default=None):
+        return unpack_session(await self._cache.aget(key, default))
+
+    async def aset(self, key, value, timeout=None):
+        return await self._cache.aset(key, pack_session(value), timeout)
+
+    async def aadd(self, key, value, timeout=None):
+        return await self._cache.aadd(key, pack_session(value), timeout)
+
+
+class CacheSessionStore(cache_backend.SessionStore):
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._cache = CompactSessionCache(self._cache)
+
+
+class CachedDBSessionStore(cached_db_backend.SessionStore):
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._cache = CompactSessionCache(self._cache)
+
+
+# Dipakai Django via SESSION_ENGINE = 'auth.session_backend'
+SessionStore = CachedDBSessionStore if getattr(settings, 'SESSION_WRITE_THROUGH', False) else CacheSessionStore
@@ -0,0 +1,80 @@
+"""
+Index session per user di Redis (SET sessions:user:<id> -> session_key).
+django_session nggak punya kolom user, jadi tanpa index ini "logout everywhere"
+harus decode semua session. Dengan index biayanya O(jumlah session user itu).
+"""
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django_redis import get_redis_connection
+
+INDEX_KEY = "sessions:user:{user_id}"
+
+# Kalau index user sudah sebesar ini, buang session yang sudah expired
+PRUNE_THRESHOLD = 50
+
+
+def _redis():
+    return get_redis_connection(settings.SESSION_CACHE_ALIAS)
+
+
+def _session_store():
+    return import_module(settings.SESSION_ENGINE).SessionStore
+
+
+def session_user_id(request, user):
+    """
+    User yang logout. DRF (cuma TokenAuthentication) bikin request.user anonymous walau
+    session-nya valid, jadi ambil dari session yang belum di-flush.
+    """
+    if user is not None:
+        return user.pk
+    session = getattr(request, 'session', None)
+    user_id = session.get(SESSION_KEY) if session is not None else None
+    return int(user_id) if user_id else None
+
+
+def add_session(user_id, session_key):
+    key = INDEX_KEY.format(user_id=user_id)
+    redis = _redis()
+
+    pipe = redis.pipeline()
+    pipe.sadd(key, session_key)
+    pipe.expire(key, settings.SESSION_COOKIE_AGE)
+    pipe.scard(key)
+    size = pipe.execute()[-1]
+
+    if size > PRUNE_THRESHOLD:
+        prune_sessions(user_id)
+
+
+def remove_session(user_id, session_key):
+    _redis().srem(INDEX_KEY.format(user_id=user_id), session_key)
+
+
+def get_sessions(user_id):
+    return {member.decode() for member in _redis().smembers(INDEX_KEY.format(user_id=user_id))}
+
+
+def prune_sessions(user_id):
+    store = _session_store()()
+    stale = [session_key for session_key in get_sessions(user_id) if not store.exists(session_key)]
+    if stale:
+        _redis().srem(INDEX_KEY.format(user_id=user_id), *stale)
+    return len(stale)
+
+
+def revoke_user_sessions(user_id, keep=None):
+    """
+    Hapus semua session milik user (kecuali `keep`), return jumlah yang di-revoke.
+    """
+    store_class = _session_store()
+    session_keys = get_sessions(user_id) - {keep}
+
+    for session_key in session_keys:
+        store_class(session_key=session_key).delete()
+
+    if session_keys:
+        _redis().srem(INDEX_KEY.format(user_id=user_id), *session_keys)
+    return len(session_keys)
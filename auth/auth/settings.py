@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+from importlib.util import find_spec
 import os
 from .local_settings import *
 
@@ -44,6 +45,7 @@ INSTALLED_APPS = [
     'drf_spectacular',
     'rest_framework',
     'django_filters',
+    'auth.accounts.apps.AccountsConfig',
 ]
 
 
@@ -52,7 +54,17 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.TokenAuthentication',
         # 'rest_framework.authentication.SessionAuthentication',
-    ]
+    ],
+    # JSON pakai orjson, MessagePack buat service-to-service (Accept / Content-Type: application/msgpack)
+    'DEFAULT_RENDERER_CLASSES': [
+        'auth.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ] + (['auth.renderers.MessagePackRenderer'] if find_spec('msgpack') else []),
+    'DEFAULT_PARSER_CLASSES': [
+        'auth.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ] + (['auth.renderers.MessagePackParser'] if find_spec('msgpack') else []),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -74,10 +86,12 @@ SPECTACULAR_EXTRAS_SETTINGS = {
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'auth.middleware.SQLInstrumentationMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'auth.routers.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'auth.middleware.PrometheusMiddleware',
@@ -108,6 +122,23 @@ WSGI_APPLICATION = 'auth.wsgi.application'
 
 DATABASES = DATABASE_SERVICE
 
+# Read replica (lihat auth/routers.py). Semua alias selain 'default' dianggap replica.
+DATABASE_ROUTERS = ['auth.routers.ReplicaRouter']
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+# url_name view -> method yang read-nya boleh ke replica
+DATABASE_REPLICA_VIEWS = {
+    'users-list': ('GET', 'HEAD'),
+    'users-detail': ('GET', 'HEAD'),
+    'auth-verify-session-view': ('POST',),
+    'auth-login-view': ('POST',),
+    # users-resolve-users sengaja nggak di sini: miss-nya di-cache, jadi harus baca primary
+}
+
+REPLICA_PIN_SECONDS = 5         # setelah write, user dipin ke primary selama ini
+REPLICA_MAX_LAG_SECONDS = 2     # replica dengan lag lebih dari ini di-skip
+REPLICA_LAG_CHECK_INTERVAL = 5  # cek lag tiap n detik per proses
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -156,11 +187,46 @@ CSRF_TRUSTED_ORIGINS = CSRF_SERVICE
 
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
+        # django-redis + L1 in-process, invalidasi lewat Redis pub/sub (auth/cache_backend.py)
+        "BACKEND": "auth.cache_backend.TwoTierRedisCache",
         "LOCATION": "redis://127.0.0.1:6379/1",
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
             "SERIALIZER": "django_redis.serializers.json.JSONSerializer",
+            "L1_MAX_ENTRIES": 10000,
+            "L1_TTL": 2,  # detik, batas maksimal data basi di L1 kalau pesan invalidasi hilang
+            "L1_CHANNEL": "cache:l1:invalidate",
         }
     }
-}
\ No newline at end of file
+}
+
+# Session disimpan di Redis (lihat auth/session_backend.py)
+# SESSION_WRITE_THROUGH = True -> juga ditulis ke django_session (cached_db) biar tahan Redis restart
+SESSION_ENGINE = 'auth.session_backend'
+SESSION_CACHE_ALIAS = 'default'
+SESSION_WRITE_THROUGH = False
+
+# Pushgateway buat metrics job batch (mis. purge_sessions), None = nggak di-push
+PROMETHEUS_PUSHGATEWAY = None
+
+# Instrumentasi SQL per route (auth.middleware.SQLInstrumentationMiddleware)
+SQL_INSTRUMENTATION_SAMPLE_RATE = 0.05  # 5% request
+SQL_N_PLUS_ONE_THRESHOLD = 10           # shape query sama >= 10x dalam 1 request = kemungkinan N+1
+
+# POST /api/users/resolve/
+USER_RESOLVE_MAX_IDS = 5000
+USER_RESOLVE_CACHE_TIMEOUT = 600
+
+# Claim otorisasi di internal token (auth/claims.py)
+AUTH_CLAIMS_MAX_BYTES = 2048              # lebih dari ini, permission dikirim sebagai bitset / dipotong
+AUTH_CLAIMS_PERMISSION_BITSET = False     # True = selalu kirim permission sebagai bitset Permission.id
+AUTH_CLAIMS_CACHE_TIMEOUT = 3600
+
+# True = last_login & audit login/logout di-buffer di Redis. WAJIB jalankan worker
+# `manage.py flush_login_events --loop`, kalau nggak last_login nggak pernah ke-update
+# dan list login:events di Redis terus membesar (lihat README)
+LOGIN_WRITE_BEHIND = False
+LOGIN_EVENTS_FLUSH_INTERVAL = 5  # detik, delay maksimal sampai data masuk database
+
+# Refresh token (auth/refresh_tokens.py), umur absolut satu family dalam detik
+REFRESH_TOKEN_LIFETIME = 60 * 60 * 24 * 14
\ No newline at end of file
@@ -0,0 +1,41 @@
+"""
+Settings buat benchmark offline (python manage.py bench_auth).
+
+    DJANGO_SETTINGS_MODULE=auth.settings_bench python manage.py bench_auth
+
+Database pakai SQLite di folder temp, cache pakai fakeredis (pip install fakeredis)
+atau Redis lokal kalau BENCH_REDIS_URL di-set. HR service diganti stub HTTP server
+yang dijalankan sendiri oleh harness.
+"""
+import os
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *
+
+DEBUG = False
+ALLOWED_HOSTS = ['*']
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(tempfile.gettempdir(), 'auth_bench.sqlite3'),
+    }
+}
+
+BENCH_REDIS_URL = os.environ.get('BENCH_REDIS_URL')
+
+if BENCH_REDIS_URL:
+    CACHES['default']['LOCATION'] = BENCH_REDIS_URL
+else:
+    try:
+        import fakeredis
+    except ImportError:
+        raise ImproperlyConfigured("Benchmark butuh fakeredis (pip install fakeredis) atau BENCH_REDIS_URL ke Redis lokal")
+
+    CACHES['default']['LOCATION'] = 'redis://bench/0'
+    CACHES['default']['OPTIONS']['CONNECTION_POOL_KWARGS'] = {
+        'connection_class': fakeredis.FakeConnection,
+        'server': fakeredis.FakeServer(),
+    }
@@ -0,0 +1,29 @@
+"""
+Settings buat test suite.
+
+    DJANGO_SETTINGS_MODULE=auth.settings_test python manage.py test auth.tests
+
+Sama dengan settings_bench (SQLite + fakeredis), tanpa perlu MySQL / Redis / HR service.
+"""
+import os
+import tempfile
+
+from .settings_bench import *
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(tempfile.gettempdir(), 'auth_test.sqlite3'),
+    },
+    # Replica = mirror default (satu database), dipakai test router
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(tempfile.gettempdir(), 'auth_test_replica.sqlite3'),
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+# Routing ke replica cuma aktif di test yang override_settings(DATABASE_REPLICAS=['replica'])
+DATABASE_REPLICAS = []
+
+# test nggak boleh tergantung sampling
+SQL_INSTRUMENTATION_SAMPLE_RATE = 1.0
@@ -0,0 +1,46 @@
+"""
+Helper buat test: pastikan jumlah query per endpoint nggak melewati budget.
+
+    with query_budget(3):
+        client.get('/api/users/')
+
+    assert_query_budget(client, 'get', '/api/users/', 3)
+"""
+from contextlib import contextmanager
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from .middleware import QueryStats
+
+
+@contextmanager
+def query_budget(max_queries, using='default', n_plus_one_threshold=None):
+    """
+    Gagal (AssertionError) kalau query di dalam blok lebih dari `max_queries`,
+    atau kalau ada shape query yang berulang >= `n_plus_one_threshold` kali.
+    """
+    stats = QueryStats()
+    connection = connections[using]
+
+    with CaptureQueriesContext(connection) as ctx, connection.execute_wrapper(stats):
+        yield ctx
+
+    if stats.count > max_queries:
+        queries = "\n".join(f"  {q['sql']}" for q in ctx.captured_queries)
+        raise AssertionError(f"{stats.count} queries executed, budget is {max_queries}:\n{queries}")
+
+    if n_plus_one_threshold:
+        repeated = stats.repeated_shapes(n_plus_one_threshold)
+        if repeated:
+            shapes = "\n".join(f"  {n}x {shape}" for shape, n in repeated.items())
+            raise AssertionError(f"Repeated query shapes (likely N+1):\n{shapes}")
+
+
+def assert_query_budget(client, method, path, max_queries, n_plus_one_threshold=None, **kwargs):
+    """
+    Panggil endpoint lewat test client (Django / DRF) dan cek budget query-nya. Return response.
+    """
+    with query_budget(max_queries, n_plus_one_threshold=n_plus_one_threshold):
+        response = getattr(client, method.lower())(path, **kwargs)
+    return response
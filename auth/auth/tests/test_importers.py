@@ -0,0 +1,47 @@
+import io
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from auth.importers import import_users
+from auth.refresh_tokens import get_families, issue_refresh_token
+from auth.session_index import add_session, get_sessions
+
+
+class ImportUsersTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            'imported', 'old@example.com', 'old-password', first_name='Old', is_staff=True,
+        )
+        add_session(self.user.pk, 'session-key')
+        issue_refresh_token(self.user.pk)
+
+    def run_import(self, csv):
+        return import_users(io.StringIO(csv), 'users.csv')
+
+    def test_blank_cells_keep_existing_values(self):
+        self.run_import("username,email,first_name,is_active,is_staff\nimported,,,,\n")
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email, 'old@example.com')
+        self.assertEqual(self.user.first_name, 'Old')
+        self.assertTrue(self.user.is_active)
+        self.assertTrue(self.user.is_staff)
+        self.assertTrue(self.user.check_password('old-password'))
+        self.assertEqual(get_sessions(self.user.pk), {'session-key'})
+
+    def test_deactivation_revokes_sessions_and_refresh_tokens(self):
+        self.run_import("username,is_active\nimported,false\n")
+
+        self.assertEqual(get_sessions(self.user.pk), set())
+        self.assertEqual(get_families(self.user.pk), set())
+
+    def test_password_change_revokes_sessions_and_refresh_tokens(self):
+        self.run_import("username,raw_password\nimported,new-password-123\n")
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('new-password-123'))
+        self.assertEqual(get_sessions(self.user.pk), set())
+        self.assertEqual(get_families(self.user.pk), set())
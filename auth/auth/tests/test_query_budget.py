@@ -0,0 +1,45 @@
+from django.contrib.auth.models import Group, Permission, User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from auth.testing import assert_query_budget
+
+# users + prefetch groups + prefetch user_permissions, berapapun jumlah user-nya
+USERS_LIST_BUDGET = 3
+
+
+class UsersListQueryBudgetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        group = Group.objects.create(name='staff')
+        permission = Permission.objects.get(codename='view_user')
+        for i in range(30):
+            user = User.objects.create(username=f'user{i}', email=f'user{i}@example.com')
+            user.groups.add(group)
+            user.user_permissions.add(permission)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_users_list(self):
+        response = assert_query_budget(self.client, 'get', '/api/users/', USERS_LIST_BUDGET, n_plus_one_threshold=5)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 30)
+
+    def test_users_list_fields(self):
+        response = assert_query_budget(
+            self.client, 'get', '/api/users/', USERS_LIST_BUDGET, n_plus_one_threshold=5,
+            data={'fields': 'id,username,email,groups'},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data[0]), {'id', 'username', 'email', 'groups'})
+
+    def test_users_list_filtered(self):
+        User.objects.filter(username__in=['user1', 'user10', 'user2']).update(is_staff=True)
+
+        response = assert_query_budget(
+            self.client, 'get', '/api/users/', USERS_LIST_BUDGET, n_plus_one_threshold=5,
+            data={'is_staff': 'true', 'search': 'user1'},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({row['username'] for row in response.data}, {'user1', 'user10'})
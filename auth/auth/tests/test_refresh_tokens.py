@@ -0,0 +1,89 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from auth.refresh_tokens import get_families, issue_refresh_token
+
+
+class RefreshTokenTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('refresh', 'refresh@example.com', 'refresh-password')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def refresh(self, token):
+        return self.client.post('/api/auth/refresh/', {'refresh_token': token}, format='json')
+
+    def test_rotate(self):
+        token = issue_refresh_token(self.user.pk)
+
+        response = self.refresh(token)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['internal_token'])
+        self.assertNotEqual(response.data['refresh_token'], token)
+        # family sama, cuma secret-nya yang dirotasi
+        self.assertEqual(response.data['refresh_token'].split('.')[0], token.split('.')[0])
+
+        response = self.refresh(response.data['refresh_token'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_reuse_revokes_family(self):
+        token = issue_refresh_token(self.user.pk)
+        rotated = self.refresh(token).data['refresh_token']
+
+        response = self.refresh(token)
+        self.assertEqual(response.status_code, 401)
+        # token terbaru (yang mungkin dipegang pencuri / korban) ikut mati
+        self.assertEqual(self.refresh(rotated).status_code, 401)
+        self.assertEqual(get_families(self.user.pk), set())
+
+    def test_reuse_keeps_other_families(self):
+        other = issue_refresh_token(self.user.pk)
+        token = issue_refresh_token(self.user.pk)
+        self.refresh(token)
+        self.refresh(token)
+
+        self.assertEqual(self.refresh(other).status_code, 200)
+
+    def test_logout_revokes_refresh_token(self):
+        token = issue_refresh_token(self.user.pk)
+        self.client.force_login(self.user)
+
+        response = self.client.post('/api/auth/logout/', {'refresh_token': token}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.refresh(token).status_code, 401)
+
+    def test_inactive_user_is_rejected(self):
+        token = issue_refresh_token(self.user.pk)
+        # tanpa signal, claim yang ke-cache juga belum ada
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        self.assertEqual(self.refresh(token).status_code, 401)
+        self.assertEqual(get_families(self.user.pk), set())
+
+    def test_malformed_tokens(self):
+        issue_refresh_token(self.user.pk)
+        malformed = [
+            f'user:{self.user.pk}.x',  # dulu kena SET refresh:user:<id> -> WRONGTYPE (500)
+            'garbage',
+            '',
+            'A' * 16 + '.',
+            'A' * 16 + '.' + 'B' * 31,
+            '../' * 10 + '.' + 'B' * 32,
+            'A' * 16 + '.' + 'B' * 32 + '\n',
+            12345,
+            ['A' * 16 + '.' + 'B' * 32],
+        ]
+        for token in malformed:
+            with self.subTest(token=token):
+                self.assertEqual(self.refresh(token).status_code, 401)
+
+                self.client.force_login(self.user)
+                response = self.client.post('/api/auth/logout/', {'refresh_token': token}, format='json')
+                self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.refresh(None).status_code, 401)
@@ -0,0 +1,102 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from auth import routers
+
+PASSWORD = 'router-password'
+
+
+@override_settings(DATABASE_REPLICAS=['replica'], REPLICA_MAX_LAG_SECONDS=2)
+class ReplicaRouterTest(TransactionTestCase):
+    # TestCase nahan transaksi di koneksi primary, koneksi replica (SQLite yang sama) jadi ke-lock
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        self.user = User.objects.create_user('router', 'router@example.com', PASSWORD)
+        self.token = Token.objects.create(user=self.user)
+        cache.clear()
+        routers._lag_cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def request_sql(self, method, path, client=None, **kwargs):
+        """Return (response, SQL di primary, SQL di replica)."""
+        client = client or self.client
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = getattr(client, method)(path, **kwargs)
+        return response, [q['sql'] for q in primary], [q['sql'] for q in replica]
+
+    def request(self, method, path, **kwargs):
+        """Return (response, jumlah query di primary, jumlah query di replica)."""
+        response, primary, replica = self.request_sql(method, path, **kwargs)
+        return response, len(primary), len(replica)
+
+    def test_listed_view_reads_from_replica(self):
+        response, primary, replica = self.request('get', '/api/users/')
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(replica, 0)
+        # lookup token juga ke replica: DRF baru autentikasi di dalam view, setelah process_view
+        self.assertEqual(primary, 0)
+
+    def test_reads_after_write_are_pinned_to_primary(self):
+        response = self.client.post(
+            '/api/auth/change-password/',
+            {'old_password': PASSWORD, 'new_password': PASSWORD + '-2'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+
+        response, primary, replica = self.request('get', '/api/users/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(replica, 0)
+        self.assertGreater(primary, 0)
+
+    def test_read_only_post_does_not_pin(self):
+        response = self.client.post('/api/users/resolve/', {'ids': [self.user.pk]}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        response, primary, replica = self.request('get', '/api/users/')
+        self.assertGreater(replica, 0)
+        self.assertEqual(primary, 0)
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        for lag in (None, 10):
+            routers._lag_cache.clear()
+            with self.subTest(lag=lag), mock.patch.object(routers, '_query_lag', return_value=lag):
+                response, primary, replica = self.request('get', '/api/users/')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(replica, 0)
+                self.assertGreater(primary, 0)
+
+    @override_settings(DATABASE_REPLICA_VIEWS={'users-list': ('GET', 'HEAD')})
+    def test_unlisted_view_stays_on_primary(self):
+        response, primary, replica = self.request('get', f'/api/users/{self.user.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(replica, 0)
+        self.assertGreater(primary, 0)
+
+    def test_claims_are_built_from_primary(self):
+        # verify-session boleh baca replica, tapi claim yang di-cache harus dari primary
+        client = APIClient()
+        client.force_login(self.user)
+
+        response, primary, replica = self.request_sql('post', '/api/auth/verify-session/', client=client)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(any('auth_permission' in sql for sql in primary))
+        self.assertFalse([sql for sql in replica if 'auth_group' in sql or 'auth_permission' in sql])
+
+    @override_settings(DATABASE_REPLICA_VIEWS={'users-resolve-users': ('POST',)})
+    def test_resolve_cache_misses_read_primary(self):
+        # walaupun view-nya di-route ke replica, hasil yang di-cache harus dari primary
+        response, primary, replica = self.request_sql('post', '/api/users/resolve/', data={'ids': [self.user.pk]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(any('FROM "auth_user"' in sql for sql in primary))
+        self.assertFalse([sql for sql in replica if 'FROM "auth_user"' in sql])
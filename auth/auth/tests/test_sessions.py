@@ -0,0 +1,47 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from auth.refresh_tokens import get_families, issue_refresh_token
+from auth.session_index import add_session, get_sessions
+
+
+class LogoutAllTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('sessions', 'sessions@example.com', 'sessions-password')
+
+    def setUp(self):
+        cache.clear()
+
+    def login(self):
+        client = APIClient()
+        client.force_login(self.user)
+        add_session(self.user.pk, client.session.session_key)
+        return client
+
+    def test_logout_all_with_session(self):
+        client, other = self.login(), self.login()
+        issue_refresh_token(self.user.pk)
+
+        response = client.post('/api/auth/logout-all/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['revoked_sessions'], 2)
+        self.assertEqual(response.data['revoked_refresh_tokens'], 1)
+        self.assertEqual(get_sessions(self.user.pk), set())
+        self.assertEqual(get_families(self.user.pk), set())
+        self.assertEqual(other.post('/api/auth/verify-session/').status_code, 401)
+
+    def test_logout_all_with_token(self):
+        self.login()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+
+        response = client.post('/api/auth/logout-all/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['revoked_sessions'], 1)
+
+    def test_logout_all_anonymous(self):
+        self.assertEqual(APIClient().post('/api/auth/logout-all/').status_code, 401)
@@ -0,0 +1,36 @@
+import datetime
+
+import jwt
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+from django.conf import settings
+from pathlib import Path
+
+from .claims import get_claims
+
+# Load PRIVATE_KEY buat sign internal token
+PRIVATE_KEY = Path(settings.BASE_DIR, "keys/private.pem").read_text()
+
+# Di-parse sekali saja: parse PEM (plus cek key RSA) tiap jwt.encode makan ~40ms
+SIGNING_KEY = load_pem_private_key(PRIVATE_KEY.encode(), password=None)
+
+INTERNAL_TOKEN_LIFETIME = datetime.timedelta(minutes=10)
+
+
+def sign_internal_token(user_id, claims, lifetime=INTERNAL_TOKEN_LIFETIME):
+    # Selalu ada exp: claim otorisasi nggak boleh berlaku selamanya
+    now = datetime.datetime.utcnow()
+    payload = {
+        "user_id": user_id,
+        "claims": claims,
+        "exp": now + lifetime,
+        "iat": now,
+        "iss": "AUTH_SERVICE"
+    }
+    return jwt.encode(payload, SIGNING_KEY, algorithm="RS256")
+
+
+def issue_internal_token(user, lifetime=INTERNAL_TOKEN_LIFETIME):
+    """
+    Internal token (RS256) berisi user_id + claim otorisasi (lihat auth/claims.py).
+    """
+    return sign_internal_token(user.id, get_claims(user), lifetime)
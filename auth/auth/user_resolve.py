@@ -0,0 +1,59 @@
+"""
+Resolve banyak user id -> username & email sekaligus (buat service lain: HR, Finance).
+Satu query values() dengan kolom tetap, hasil per id di-cache di Redis.
+"""
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections
+
+RESOLVE_KEY = "user:resolve:{user_id}"
+RESOLVE_FIELDS = ('id', 'username', 'email')
+
+
+def _cache_key(user_id):
+    return RESOLVE_KEY.format(user_id=user_id)
+
+
+def resolve_users(ids):
+    """
+    Return (found, missing): found = {id: {'username': .., 'email': ..}}, missing = id yang nggak ada.
+    """
+    ids = list(dict.fromkeys(ids))
+    cached = cache.get_many([_cache_key(user_id) for user_id in ids])
+
+    found = {}
+    pending = []
+    for user_id in ids:
+        data = cached.get(_cache_key(user_id))
+        if data is None:
+            pending.append(user_id)
+        else:
+            found[user_id] = data
+
+    if pending:
+        # Selalu dari primary: hasil di-cache USER_RESOLVE_CACHE_TIMEOUT, kalau dibaca dari replica
+        # yang lag, username / email lama yang baru di-invalidate bisa ke-cache lagi
+        queryset = User.objects.using('default')
+        batch_size = connections[queryset.db].features.max_query_params or len(pending)
+
+        fresh = {}
+        for start in range(0, len(pending), batch_size):
+            for row in queryset.filter(pk__in=pending[start:start + batch_size]).values(*RESOLVE_FIELDS):
+                fresh[row.pop('id')] = row
+
+        if fresh:
+            cache.set_many(
+                {_cache_key(user_id): data for user_id, data in fresh.items()},
+                timeout=getattr(settings, 'USER_RESOLVE_CACHE_TIMEOUT', 600),
+            )
+        found.update(fresh)
+
+    missing = [user_id for user_id in ids if user_id not in found]
+    return found, missing
+
+
+def invalidate_users(ids):
+    ids = list(ids)
+    if ids:
+        cache.delete_many([_cache_key(user_id) for user_id in ids])
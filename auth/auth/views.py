@@ -1,9 +1,8 @@
-import jwt, datetime, requests, subprocess
+import requests, subprocess
 from django.contrib.auth import authenticate, login, logout
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from django.contrib.auth import get_user_model, authenticate
-from django.contrib.sessions.models import Session
+from django.contrib.auth import get_user_model, authenticate, update_session_auth_hash, SESSION_KEY
 from django.http import HttpResponse
 
 from .local_settings import *
@@ -11,26 +10,38 @@ from .filters import *
 from .serializers import GitSerializer, UserSerializer
 from .local_settings import *
 from .config import fetch_external_data
+from .importers import DEFAULT_CHUNK_SIZE, import_users
+from .session_index import add_session, remove_session, revoke_user_sessions, session_user_id
+from .refresh_tokens import (
+    RefreshTokenError, RefreshTokenReused, issue_refresh_token, revoke_refresh_token, revoke_user_refresh_tokens,
+    rotate_refresh_token,
+)
+from .user_resolve import resolve_users
 
 from drf_spectacular.utils import OpenApiParameter, extend_schema, OpenApiRequest, OpenApiExample
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import viewsets, status
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.parsers import MultiPartParser, FormParser
 
 from drf_spectacular.types import OpenApiTypes
 
 from pathlib import Path
+from importlib import import_module
 
 from django.conf import settings
     
 from prometheus_client import generate_latest, REGISTRY
 
-# Load PRIVATE_KEY buat sign internal token
-PRIVATE_KEY = Path(settings.BASE_DIR, "keys/private.pem").read_text()
+from .claims import get_claims_by_id
+from .tokens import INTERNAL_TOKEN_LIFETIME, issue_internal_token, sign_internal_token
 
 User = get_user_model()
 
+# Baca session lewat engine yang aktif (Redis / cached_db), bukan langsung ke tabel django_session
+SessionStore = import_module(settings.SESSION_ENGINE).SessionStore
+
 @extend_schema(tags=['Auth'])
 class AuthViewSet(viewsets.ViewSet):
     serializer_class = UserSerializer
@@ -62,14 +73,10 @@ class AuthViewSet(viewsets.ViewSet):
         login(request, user)
         session_id = request.session.session_key
 
-        # Buat internal token (valid 10 menit misalnya)
-        payload = {
-            "user_id": user.id,
-            "exp": datetime.datetime.utcnow() + datetime.timedelta(minutes=10),
-            "iat": datetime.datetime.utcnow(),
-            "iss": "AUTH_SERVICE"
-        }
-        internal_token = jwt.encode(payload, PRIVATE_KEY, algorithm="RS256")
+        # Buat internal token (valid 10 menit), sudah termasuk claim otorisasi
+        internal_token = issue_internal_token(user)
+        # Buat perpanjang internal_token lewat /api/auth/refresh/ tanpa login ulang
+        refresh_token = issue_refresh_token(user.pk)
 
         employee_data = None
         if not user.is_superuser:
@@ -92,6 +99,7 @@ class AuthViewSet(viewsets.ViewSet):
         resp =  Response({
             'sessionid': session_id,
             'internal_token': internal_token,
+            'refresh_token': refresh_token,
             'user_data': UserSerializer(user, context={'request': request}).data,
             'employee_data': employee_data
         }, status=status.HTTP_200_OK)
@@ -109,10 +117,77 @@ class AuthViewSet(viewsets.ViewSet):
     @method_decorator(csrf_exempt)
     @action(detail=False, methods=['post'], url_path='logout')
     def logout_view(self, request):
-        request.session.flush()
+        # logout() sudah flush session, nggak perlu flush dua kali
         logout(request)
+        refresh_token = request.data.get('refresh_token')
+        if refresh_token:
+            revoke_refresh_token(refresh_token)
         return Response({'message': 'Logout berhasil'}, status=status.HTTP_200_OK)
 
+    # ================= LOGOUT ALL (semua device) =================
+    @method_decorator(csrf_exempt)
+    @action(detail=False, methods=['post'], url_path='logout-all')
+    def logout_all_view(self, request):
+        # Client session (cookie dari login_view) nggak dikenali DRF (cuma TokenAuthentication),
+        # jadi user id diambil dari session kalau request.user anonymous
+        user = request.user if request.user.is_authenticated else None
+        user_id = session_user_id(request, user)
+        if user_id is None:
+            return Response({'detail': 'Authentication credentials were not provided.'}, status=status.HTTP_401_UNAUTHORIZED)
+
+        revoked = revoke_user_sessions(user_id)
+        revoked_refresh = revoke_user_refresh_tokens(user_id)
+        logout(request)
+        return Response({
+            'message': 'Logout berhasil',
+            'revoked_sessions': revoked,
+            'revoked_refresh_tokens': revoked_refresh,
+        }, status=status.HTTP_200_OK)
+
+    # ================= REFRESH (perpanjang internal token) =================
+    @method_decorator(csrf_exempt)
+    @extend_schema(
+        description="Tukar refresh token dengan internal token baru + refresh token baru (rotasi). "
+                    "Refresh token lama langsung nggak berlaku; kalau dipakai lagi, semua turunannya ikut di-revoke.",
+        request={
+            'application/json': {
+                'type': 'object',
+                'properties': {
+                    'refresh_token': {'type': 'string'},
+                },
+                'required': ['refresh_token']
+            }
+        },
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=['post'], url_path='refresh')
+    def refresh_view(self, request):
+        # Nggak ada PBKDF2 / HR call: 1x Lua di Redis + claim dari cache + 1x sign
+        try:
+            user_id, refresh_token = rotate_refresh_token(request.data.get('refresh_token'))
+        except RefreshTokenReused as e:
+            print(f"[WARN] {e}, token family revoked")
+            return Response({'detail': 'Refresh token already used'}, status=status.HTTP_401_UNAUTHORIZED)
+        except RefreshTokenError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_401_UNAUTHORIZED)
+
+        # Claim dari cache (database cuma kalau miss). Dicek di sini juga karena user bisa
+        # dinonaktifkan tanpa signal (QuerySet.update), jadi family-nya belum tentu sudah di-revoke
+        try:
+            claims = get_claims_by_id(user_id)
+        except User.DoesNotExist:
+            claims = None
+        if not claims or not claims.get('a'):
+            revoke_user_refresh_tokens(user_id)
+            return Response({'detail': 'Invalid or expired refresh token'}, status=status.HTTP_401_UNAUTHORIZED)
+
+        internal_token = sign_internal_token(user_id, claims)
+        return Response({
+            'internal_token': internal_token,
+            'refresh_token': refresh_token,
+            'expires_in': int(INTERNAL_TOKEN_LIFETIME.total_seconds()),
+        }, status=status.HTTP_200_OK)
+
     # ================= VERIFY SESSION (frontend) =================
     @method_decorator(csrf_exempt)
     @action(detail=False, methods=['post'], url_path='verify-session')
@@ -122,21 +197,23 @@ class AuthViewSet(viewsets.ViewSet):
             return Response({"detail": "Missing sessionid"}, status=status.HTTP_401_UNAUTHORIZED)
 
         try:
-            session = Session.objects.get(session_key=sessionid)
-            uid = session.get_decoded().get('_auth_user_id')
+            uid = SessionStore(session_key=sessionid).get(SESSION_KEY)
+            if uid is None:
+                return Response({"detail": "Invalid session"}, status=status.HTTP_401_UNAUTHORIZED)
             user = User.objects.get(pk=uid)
 
-            # Kalau mau sekalian generate internal_token
-            payload = {"user_id": user.id}
-            internal_token = jwt.encode(payload, PRIVATE_KEY, algorithm="RS256")
+            # Kalau mau sekalian generate internal_token (expire sama dengan token login,
+            # claim di dalamnya nggak boleh berlaku selamanya)
+            internal_token = issue_internal_token(user)
 
             return Response({
                 "valid": True,
                 "user_id": user.id,
-                "internal_token": internal_token
+                "internal_token": internal_token,
+                "expires_in": int(INTERNAL_TOKEN_LIFETIME.total_seconds()),
             }, status=status.HTTP_200_OK)
 
-        except Session.DoesNotExist:
+        except User.DoesNotExist:
             return Response({"detail": "Invalid session"}, status=status.HTTP_401_UNAUTHORIZED)
 
     # ================= CHANGE PASSWORD =================
@@ -152,16 +229,31 @@ class AuthViewSet(viewsets.ViewSet):
         if not user.check_password(old):
             return Response({'detail': 'Old password is incorrect.'}, status=status.HTTP_400_BAD_REQUEST)
 
+        # Session yang lagi dipakai tetap hidup, session lain (device lain) di-revoke
+        current_key = request.session.session_key if request.session.get(SESSION_KEY) == str(user.pk) else None
+
         user.set_password(new)  # ✅ pakai new, bukan old
         user.save()
 
-        return Response({'detail': 'Password updated successfully.'}, status=status.HTTP_200_OK)
+        revoked = revoke_user_sessions(user.pk, keep=current_key)
+        # refresh token lama (bisa jadi ada di tangan yang salah) ikut dimatikan
+        revoke_user_refresh_tokens(user.pk)
+        if current_key:
+            # hash session di-update + key di-rotate, index ikut diganti
+            update_session_auth_hash(request, user)
+            remove_session(user.pk, current_key)
+            add_session(user.pk, request.session.session_key)
+
+        return Response({'detail': 'Password updated successfully.', 'revoked_sessions': revoked}, status=status.HTTP_200_OK)
     
 @extend_schema(tags=["User"])
 class UserViewSet(viewsets.ModelViewSet):
-    queryset = User.objects.all().order_by('-date_joined')
+    # groups & user_permissions ikut di-render UserSerializer, prefetch biar nggak N+1
+    queryset = User.objects.all().prefetch_related('groups', 'user_permissions').order_by('-date_joined')
     serializer_class = UserSerializer
+    filter_backends = [DjangoFilterBackend, SearchFilter]
     filterset_class = UserFilter
+    search_fields = ['username', 'email']
 
     @extend_schema(
         description="Ambil daftar user dengan pagination & filter.",
@@ -184,6 +276,84 @@ class UserViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    # ================= RESOLVE (bulk, service-to-service) =================
+    @extend_schema(
+        description="Resolve banyak user id sekaligus ke username & email. Tanpa pagination, hasil berupa map id -> user.",
+        request={
+            'application/json': {
+                'type': 'object',
+                'properties': {
+                    'ids': {'type': 'array', 'items': {'type': 'integer'}},
+                },
+                'required': ['ids']
+            }
+        },
+        responses={200: OpenApiTypes.OBJECT},
+        examples=[
+            OpenApiExample(
+                'Response',
+                value={'results': {'1': {'username': 'admin', 'email': 'admin@example.com'}}, 'missing': [99]},
+                response_only=True,
+            )
+        ]
+    )
+    @action(detail=False, methods=['post'], url_path='resolve')
+    def resolve_users(self, request):
+        ids = request.data.get('ids')
+        if isinstance(ids, str):
+            ids = [i for i in ids.split(',') if i.strip()]
+        if not isinstance(ids, list) or not ids:
+            return Response({'detail': 'ids must be a non-empty list.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        max_ids = getattr(settings, 'USER_RESOLVE_MAX_IDS', 5000)
+        if len(ids) > max_ids:
+            return Response({'detail': f'Maximum {max_ids} ids per request.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            ids = [int(i) for i in ids]
+        except (TypeError, ValueError):
+            return Response({'detail': 'ids must be integers.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        found, missing = resolve_users(ids)
+        return Response({'results': found, 'missing': missing}, status=status.HTTP_200_OK)
+
+    # ================= IMPORT (CSV / Excel) =================
+    @extend_schema(
+        description="Import / upsert user dari file CSV atau Excel (.xlsx), diproses per chunk. Upsert berdasarkan username.",
+        request={
+            'multipart/form-data': {
+                'type': 'object',
+                'properties': {
+                    'file': {'type': 'string', 'format': 'binary'},
+                    'chunk_size': {'type': 'integer', 'default': DEFAULT_CHUNK_SIZE},
+                },
+                'required': ['file']
+            }
+        },
+        responses={200: OpenApiTypes.OBJECT}
+    )
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser, FormParser], permission_classes=[IsAdminUser])
+    def import_users(self, request):
+        upload = request.FILES.get('file')
+        if not upload:
+            return Response({'detail': 'File is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            chunk_size = int(request.data.get('chunk_size') or DEFAULT_CHUNK_SIZE)
+        except (TypeError, ValueError):
+            return Response({'detail': 'chunk_size must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        chunk_size = max(1, min(chunk_size, 10000))
+
+        def on_progress(summary):
+            print(f"[INFO] import_users({upload.name}): chunk {summary['chunks']}, {summary['total_rows']} rows, {summary['failed']} failed")
+
+        try:
+            summary = import_users(upload, upload.name, chunk_size=chunk_size, on_progress=on_progress)
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(summary, status=status.HTTP_200_OK)
+
 # Endpoint untuk expose metrics ke Prometheus
 def metrics_view(request):
     return HttpResponse(generate_latest(REGISTRY), content_type="text/plain; charset=utf-8")